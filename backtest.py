@@ -0,0 +1,160 @@
+import argparse
+import json
+import sys
+import time
+from multiprocessing import Pool
+import numpy as np
+from draft_graph import build_graphs
+from draft_sequence import match_draft_steps, state_args
+from incremental import add_matches
+from main import DEFAULT_CSV, load_model, rank_heroes
+from matrix_stats import aggregate_match_table, build_match_table, compute_team_weights, matrix_to_dicts
+
+# Backtest: setiap match diputar ulang langkah demi langkah, dan rekomendasi
+# di setiap pick/ban dibandingkan dengan pilihan aslinya. Model untuk match ke-i
+# hanya dilatih dari match 0..i-1; setelah match selesai diputar, match itu
+# ditambahkan ke model lewat incremental.add_matches.
+# Match dibagi ke beberapa worker per rentang berurutan; tiap worker melatih
+# model awal dari semua match sebelum rentangnya, lalu lanjut inkremental.
+
+_matches = None
+_top_n = 5
+
+
+def _init_worker(filename, top_n):
+    global _matches, _top_n
+    _matches = load_model(filename)['matches']
+    _top_n = top_n
+
+
+def train_model(matches):
+    # Model dari daftar match (sama seperti load_or_build_snapshot tanpa snapshot)
+    stats = build_match_table(matches)
+    stats.update(aggregate_match_table(stats))
+    stats['team_weights'] = compute_team_weights(stats)
+    matches = [{'teams': dict(match['teams'])} for match in matches]
+    stats['matches'] = matches
+    hero_stats, pair_wins, versus = matrix_to_dicts(stats)
+    G_dasar, G_counter = build_graphs(hero_stats, pair_wins, versus)
+    return {
+        'stats': stats,
+        'hero_stats': hero_stats,
+        'pair_wins': pair_wins,
+        'versus': versus,
+        'matches': matches,
+        'G_dasar': G_dasar,
+        'G_counter': G_counter,
+    }
+
+
+def replay_match(model, match, top_n=5):
+    # Satu record per langkah: rank = posisi hero asli di daftar rekomendasi
+    # lengkap (1 = teratas, None jika tidak direkomendasikan sama sekali)
+    records = []
+    n_heroes = len(model['stats']['heroes'])
+    for step, (state, hero) in enumerate(match_draft_steps(match)):
+        start = time.perf_counter()
+        ranked = rank_heroes(model, *state_args(state), top_n=top_n)
+        latency = time.perf_counter() - start
+        names = [h for h, _ in ranked]
+        if hero not in names:
+            names = [h for h, _ in rank_heroes(model, *state_args(state), top_n=n_heroes)]
+        records.append({
+            'step': step,
+            'action': state['action'],
+            'team': state['team'],
+            'actual': hero,
+            'rank': names.index(hero) + 1 if hero in names else None,
+            'top': [h for h, _ in ranked],
+            'latency': latency,
+        })
+    return records
+
+
+def _replay_range(bounds):
+    lo, hi = bounds
+    model = train_model(_matches[:lo])
+    results = []
+    for m in range(lo, hi):
+        records = replay_match(model, _matches[m], _top_n)
+        for record in records:
+            record['match'] = m
+        results.append(records)
+        add_matches(model, [_matches[m]])
+    return results
+
+
+def split_ranges(start, end, parts):
+    edges = np.linspace(start, end, parts + 1).round().astype(int).tolist()
+    return [(lo, hi) for lo, hi in zip(edges, edges[1:]) if lo < hi]
+
+
+def run_backtest(filename=DEFAULT_CSV, min_train=20, workers=1, top_n=5):
+    # Generator daftar record per match, dalam urutan match
+    n_matches = len(load_model(filename, workers)['matches'])
+    start = min(max(min_train, 1), n_matches)
+    ranges = split_ranges(start, n_matches, max(1, workers))
+    if workers == 1:
+        _init_worker(filename, top_n)
+        for bounds in ranges:
+            yield from _replay_range(bounds)
+        return
+    with Pool(workers, initializer=_init_worker, initargs=(filename, top_n)) as pool:
+        for results in pool.imap(_replay_range, ranges):
+            yield from results
+
+
+def summarize(records, top_n=5):
+    summary = {}
+    for action in ('pick', 'ban', 'all'):
+        rows = [r for r in records if action == 'all' or r['action'] == action]
+        if not rows:
+            continue
+        ranks = np.array([r['rank'] for r in rows if r['rank'] is not None], dtype=np.float64)
+        latency = np.array([r['latency'] for r in rows]) * 1000
+        summary[action] = {
+            'steps': len(rows),
+            'hit_rate': float((ranks <= top_n).sum() / len(rows)),
+            'mean_rank': float(ranks.mean()) if len(ranks) else None,
+            'median_rank': float(np.median(ranks)) if len(ranks) else None,
+            'unranked': len(rows) - len(ranks),
+            'latency_ms_mean': float(latency.mean()),
+            'latency_ms_p95': float(np.percentile(latency, 95)),
+        }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Backtest rekomendasi dengan memutar ulang match historis')
+    parser.add_argument('--csv', action='append', help='data draft CSV atau folder (boleh diulang)')
+    parser.add_argument('-j', '--workers', type=int, default=1, help='jumlah proses')
+    parser.add_argument('-k', '--top', type=int, default=5, help='hit jika hero asli ada di top K')
+    parser.add_argument('--min-train', type=int, default=20, help='jumlah match awal yang hanya dipakai untuk latihan')
+    parser.add_argument('-o', '--output', help='tulis record per langkah sebagai JSONL')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    records = []
+    out = open(args.output, 'w', encoding='utf-8') if args.output else None
+    try:
+        for match_records in run_backtest(args.csv or DEFAULT_CSV, args.min_train, args.workers, args.top):
+            records.extend(match_records)
+            if out is not None:
+                for record in match_records:
+                    out.write(json.dumps(record) + '\n')
+    finally:
+        if out is not None:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    matches = len({r['match'] for r in records})
+    print(f"Backtest {matches} matches, {len(records)} steps in {elapsed:.1f}s", file=sys.stderr)
+    for action, row in summarize(records, args.top).items():
+        mean_rank = f"{row['mean_rank']:.1f}" if row['mean_rank'] is not None else '-'
+        print(f"{action:>4}: hit@{args.top} {row['hit_rate'] * 100:5.1f}%  mean rank {mean_rank}  "
+              f"unranked {row['unranked']}  latency {row['latency_ms_mean']:.2f} ms "
+              f"(p95 {row['latency_ms_p95']:.2f} ms)  [{row['steps']} steps]")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+import argparse
+import csv
+import json
+import sys
+from multiprocessing import Pool
+from draft_sequence import LIST_FIELDS, empty_state, match_draft_steps, state_args
+from main import DEFAULT_CSV, load_model, rank_heroes
+from profiling import query
+
+# Mode batch: menilai banyak draft state sekaligus (misalnya setiap langkah
+# pick/ban dari semua match historis) dan menulis hasil sebagai JSONL/CSV.
+# Setiap worker memuat model sekali dari snapshot (memory-mapped), jadi
+# graf tidak ikut di-pickle per task.
+
+_model = None
+_top_n = 5
+
+
+def _init_worker(filename, top_n):
+    global _model, _top_n
+    _model = load_model(filename)
+    _top_n = top_n
+
+
+@query('recommend')
+def _score_state(state):
+    ranked = rank_heroes(_model, *state_args(state), top_n=_top_n)
+    return state, ranked
+
+
+def _split_heroes(value):
+    return [h.strip().lower() for h in value.split(';') if h.strip()]
+
+
+def read_states(path):
+    # JSONL: satu state per baris. CSV: kolom action,team,enemy dan daftar
+    # hero dipisah ';' di kolom our_picks,our_bans,enemy_picks,enemy_bans
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            for row in csv.DictReader(f):
+                state = empty_state(row['action'].strip().lower(), row['team'].strip().lower(),
+                                    row['enemy'].strip().lower())
+                for field in LIST_FIELDS:
+                    state[field] = _split_heroes(row.get(field) or '')
+                if row.get('id'):
+                    state['id'] = row['id']
+                yield state
+        else:
+            for line in f:
+                if line.strip():
+                    state = json.loads(line)
+                    base = empty_state(state['action'], state['team'], state['enemy'])
+                    base.update(state)
+                    yield base
+
+
+def history_states(matches):
+    # Setiap langkah pick/ban dari setiap match historis
+    for m, match in enumerate(matches):
+        for step, (state, hero) in enumerate(match_draft_steps(match)):
+            state['id'] = f'{m}:{step}'
+            state['actual'] = hero
+            yield state
+
+
+def score_states(states, filename=DEFAULT_CSV, workers=None, top_n=5, chunksize=64):
+    # Generator (state, [(hero, score), ...]) dalam urutan input
+    if workers == 1:
+        _init_worker(filename, top_n)
+        for state in states:
+            yield _score_state(state)
+        return
+
+    # Pastikan snapshot sudah ada sebelum worker dimulai
+    load_model(filename, workers)
+    with Pool(workers, initializer=_init_worker, initargs=(filename, top_n)) as pool:
+        yield from pool.imap(_score_state, states, chunksize=chunksize)
+
+
+def write_jsonl(results, out):
+    for state, ranked in results:
+        record = dict(state)
+        record['recommendations'] = [{'hero': h, 'score': round(s, 6)} for h, s in ranked]
+        out.write(json.dumps(record) + '\n')
+
+
+def write_csv(results, out):
+    writer = csv.writer(out)
+    writer.writerow(['id', 'action', 'team', 'enemy', 'rank', 'hero', 'score'])
+    for i, (state, ranked) in enumerate(results):
+        for rank, (hero, score) in enumerate(ranked, 1):
+            writer.writerow([state.get('id', i), state['action'], state['team'], state['enemy'],
+                             rank, hero, f'{score:.6f}'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Batch draft pick recommendations')
+    parser.add_argument('states', nargs='?', help='draft states (.jsonl atau .csv); kosong = semua langkah historis')
+    parser.add_argument('-o', '--output', help='file output (.jsonl atau .csv), default stdout JSONL')
+    parser.add_argument('--csv', action='append', help='data draft CSV atau folder (boleh diulang)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='jumlah proses (default: semua core)')
+    parser.add_argument('-k', '--top', type=int, default=5, help='jumlah rekomendasi per state')
+    args = parser.parse_args(argv)
+    sources = args.csv or DEFAULT_CSV
+
+    if args.states:
+        states = read_states(args.states)
+    else:
+        states = history_states(load_model(sources, args.workers)['matches'])
+
+    results = score_states(states, sources, args.workers, args.top)
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        if args.output and args.output.endswith('.csv'):
+            write_csv(results, out)
+        else:
+            write_jsonl(results, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
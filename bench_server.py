@@ -0,0 +1,83 @@
+import argparse
+import http.client
+import json
+import random
+import statistics
+import threading
+import time
+from batch_recommend import history_states
+from main import DEFAULT_CSV, load_model
+from recommend_server import make_server
+
+# Benchmark latency dan throughput recommend_server dengan klien lokal.
+# Server dijalankan di thread yang sama prosesnya pada port acak, lalu
+# beberapa klien (koneksi keep-alive) mengirim draft state historis.
+
+
+def _client(port, bodies, latencies):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    for body in bodies:
+        start = time.perf_counter()
+        conn.request('POST', '/recommend', body, {'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+    conn.close()
+
+
+def run_benchmark(model, requests=2000, clients=8, seed=0):
+    states = list(history_states(model['matches']))
+    rnd = random.Random(seed)
+    bodies = [json.dumps(rnd.choice(states)) for _ in range(requests)]
+
+    server = make_server(model, port=0)
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    latencies = []
+    workers = [
+        threading.Thread(target=_client, args=(port, bodies[i::clients], latencies))
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+
+    latencies.sort()
+    ms = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return {
+        'requests': len(latencies),
+        'clients': clients,
+        'seconds': elapsed,
+        'throughput_rps': len(latencies) / elapsed,
+        'latency_ms': {
+            'mean': statistics.fmean(latencies) * 1000,
+            'p50': ms(0.50),
+            'p95': ms(0.95),
+            'p99': ms(0.99),
+            'max': latencies[-1] * 1000,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark recommend_server')
+    parser.add_argument('--csv', action='append', help='file CSV atau folder (boleh diulang)')
+    parser.add_argument('-n', '--requests', type=int, default=2000)
+    parser.add_argument('-c', '--clients', type=int, default=8)
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(load_model(args.csv or DEFAULT_CSV), args.requests, args.clients)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from itertools import islice
+from batch_recommend import history_states
+from draft_graph import (
+    build_counter_graph_simple,
+    build_sinergi_dasar_graph,
+    build_sinergi_tim_graph,
+    iter_csv_matches,
+    process_csv_streaming,
+    process_csv_with_matches,
+)
+from draft_sequence import state_args
+from main import rank_heroes
+from matrix_stats import process_csv_matrix, process_csv_matrix_streaming
+from snapshot import load_or_build_snapshot, snapshot_path_for
+from synthetic_data import write_csv
+
+# Benchmark seluruh pipeline atas data sintetis (lihat synthetic_data.py).
+# Setiap tahap diukur waktunya dan (dengan --memory) puncak alokasinya lewat
+# tracemalloc di putaran terpisah, lalu dibandingkan dengan baseline tersimpan.
+# Dataset 1M match hanya dijalankan dengan --huge, dan pada ukuran itu tahap
+# yang memuat seluruh daftar match ke memori (FULL_LIST_STAGES) dilewati dan
+# snapshot dibangun dengan process_csv_matrix_streaming.
+
+# Ukuran yang punya baseline di benchmark_baseline.json
+DEFAULT_SIZES = [10000, 100000]
+HUGE_SIZE = 1000000
+FULL_LIST_STAGES = ('parse_dict', 'parse_matrix', 'build_tim')
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+RECOMMEND_QUERIES = 200
+
+
+def dataset_path(data_dir, n_matches, n_heroes, n_teams, seed):
+    return os.path.join(data_dir, f'draft_{n_matches}m_{n_heroes}h_{n_teams}t_s{seed}.csv')
+
+
+def ensure_dataset(data_dir, n_matches, n_heroes=80, n_teams=10, seed=0):
+    os.makedirs(data_dir, exist_ok=True)
+    path = dataset_path(data_dir, n_matches, n_heroes, n_teams, seed)
+    if not os.path.exists(path):
+        write_csv(path + '.tmp', n_matches, n_heroes, n_teams, seed)
+        os.replace(path + '.tmp', path)
+    return path
+
+
+def pipeline_stages(filename, full_lists=True):
+    # Daftar (nama, fungsi); fungsi menerima dict `ctx` berisi hasil tahap sebelumnya
+    def parse_dict(ctx):
+        ctx['hero_stats'], ctx['pair_wins'], ctx['versus'], ctx['matches'] = process_csv_with_matches(filename)
+
+    def parse_stream(ctx):
+        # Tanpa parse_dict, dict untuk tahap build_* diambil dari sini
+        hero_stats, pair_wins, versus, _ = process_csv_streaming(filename)
+        ctx.setdefault('hero_stats', hero_stats)
+        ctx.setdefault('pair_wins', pair_wins)
+        ctx.setdefault('versus', versus)
+
+    def parse_matrix(ctx):
+        process_csv_matrix(filename)
+
+    def build_dasar(ctx):
+        ctx['G_dasar'] = build_sinergi_dasar_graph(ctx['pair_wins'], ctx['hero_stats'])
+
+    def build_counter(ctx):
+        build_counter_graph_simple(ctx['versus'])
+
+    def build_tim(ctx):
+        team = next(iter(ctx['matches'][0]['teams']))
+        build_sinergi_tim_graph(ctx['G_dasar'], ctx['hero_stats'], team, ctx['matches'])
+
+    def snapshot_build(ctx):
+        path = snapshot_path_for(filename)
+        if os.path.exists(path):
+            os.remove(path)
+        # Tanpa daftar match lengkap, tabel match dibaca langsung dari CSV
+        load_or_build_snapshot(filename, build_stats=process_csv_matrix if full_lists else process_csv_matrix_streaming)
+
+    def snapshot_load(ctx):
+        ctx['model'] = load_or_build_snapshot(filename)
+
+    def recommend(ctx):
+        model = ctx['model']
+        for state in islice(history_states(iter_csv_matches(filename)), RECOMMEND_QUERIES):
+            rank_heroes(model, *state_args(state))
+
+    stages = [
+        ('parse_dict', parse_dict),
+        ('parse_stream', parse_stream),
+        ('parse_matrix', parse_matrix),
+        ('build_dasar', build_dasar),
+        ('build_counter', build_counter),
+        ('build_tim', build_tim),
+        ('snapshot_build', snapshot_build),
+        ('snapshot_load', snapshot_load),
+        ('recommend', recommend),
+    ]
+    return [(name, stage) for name, stage in stages if full_lists or name not in FULL_LIST_STAGES]
+
+
+def run_stages(filename, memory=False, full_lists=True):
+    results = {}
+    ctx = {}
+    for name, stage in pipeline_stages(filename, full_lists):
+        start = time.perf_counter()
+        stage(ctx)
+        results[name] = {'seconds': time.perf_counter() - start}
+
+    if memory:
+        ctx = {}
+        for name, stage in pipeline_stages(filename, full_lists):
+            tracemalloc.start()
+            stage(ctx)
+            results[name]['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+    return results
+
+
+def check_regressions(results, baseline, tolerance):
+    failures = []
+    for size, stages in results.items():
+        for name, result in stages.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            for metric in ('seconds', 'peak_mb'):
+                if metric in result and metric in base and result[metric] > base[metric] * (1 + tolerance):
+                    failures.append(f"{size} matches / {name}: {metric} {result[metric]:.3f} > "
+                                    f"baseline {base[metric]:.3f} (+{tolerance:.0%})")
+    return failures
+
+
+def print_results(results):
+    print(f"{'matches':>9}  {'stage':<15} {'seconds':>10} {'peak MB':>9}")
+    for size, stages in results.items():
+        for name, result in stages.items():
+            peak = f"{result['peak_mb']:9.1f}" if 'peak_mb' in result else f"{'-':>9}"
+            print(f"{size:>9}  {name:<15} {result['seconds']:10.4f} {peak}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the draft pipeline on synthetic data')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='jumlah match per dataset')
+    parser.add_argument('--huge', action='store_true', help=f'tambahkan dataset {HUGE_SIZE} match')
+    parser.add_argument('--heroes', type=int, default=80)
+    parser.add_argument('--teams', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default='bench_data')
+    parser.add_argument('--memory', action='store_true', help='ukur puncak alokasi per tahap (tracemalloc)')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help='simpan hasil sebagai baseline baru')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='batas regresi relatif terhadap baseline')
+    parser.add_argument('--json', help='tulis hasil ke file JSON')
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes + [HUGE_SIZE] if args.huge and HUGE_SIZE not in args.sizes else args.sizes
+    results = {}
+    for size in sizes:
+        filename = ensure_dataset(args.data_dir, size, args.heroes, args.teams, args.seed)
+        results[str(size)] = run_stages(filename, args.memory, full_lists=size < HUGE_SIZE)
+    print_results(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline disimpan ke {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            failures = check_regressions(results, json.load(f), args.tolerance)
+        if failures:
+            print("\nRegresi terdeteksi:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print("\nTidak ada regresi terhadap baseline.")
+
+
+if __name__ == '__main__':
+    main()
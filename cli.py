@@ -0,0 +1,107 @@
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from draft_sequence import add_state_arguments, state_args, state_from_args
+from main import DEFAULT_CSV
+from profiling import query
+
+# Satu entry point untuk semua perintah:
+#   python cli.py recommend pick onic rrq --our-bans fanny,joy,ling --enemy-bans chip,zhuxin,yve
+#   python cli.py visualize dasar synergy.png --min-weight 3
+#   python cli.py build-snapshot --csv leagues/
+# Modul tiap perintah (dan numpy/NetworkX/matplotlib) baru di-import saat
+# perintah itu dijalankan.
+
+# Perintah yang diteruskan ke main() modul lain beserta sisa argumennya
+DELEGATES = {
+    'visualize': ('graph_visualization', 'render graf ke PNG/SVG (tanpa argumen: menu interaktif)'),
+    'serve': ('recommend_server', 'server rekomendasi HTTP'),
+    'batch': ('batch_recommend', 'rekomendasi untuk banyak draft state'),
+    'search': ('draft_search', 'lookahead alpha-beta'),
+    'simulate': ('simulate', 'simulasi Monte Carlo peluang menang'),
+    'backtest': ('backtest', 'backtest dengan match historis'),
+    'phases': ('phase_index', 'statistik pick/ban per fase'),
+}
+
+
+@query('recommend')
+def _rank(model, state, top_n):
+    from main import cached_rank_heroes
+    return cached_rank_heroes(model, *state_args(state), top_n=top_n)
+
+
+def recommend(args):
+    from main import load_model
+    model = load_model(args.csv or DEFAULT_CSV)
+    ranked = _rank(model, state_from_args(args), args.top)
+    if args.json:
+        print(json.dumps([{'hero': hero, 'score': score} for hero, score in ranked]))
+        return
+    print(f"\nTop {args.top} hero recommendations for {args.action.upper()}:")
+    for hero, score in ranked:
+        print(f"{hero} : {score:.4f}")
+
+
+def build_snapshot(args):
+    from main import load_model, model_snapshot_path
+    sources = args.csv or DEFAULT_CSV
+    path = model_snapshot_path(sources)
+    if args.force and os.path.exists(path):
+        os.remove(path)
+    start = time.perf_counter()
+    model = load_model(sources, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"{path}: {len(model['stats']['side_team']) // 2} matches, {len(model['stats']['heroes'])} heroes ({elapsed:.2f}s)")
+
+
+def visualize(args):
+    module = importlib.import_module('graph_visualization')
+    if args.rest:
+        module.export_main(args.rest)
+    else:
+        module.main()
+
+
+def delegate(args):
+    importlib.import_module(DELEGATES[args.command][0]).main(args.rest)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Draft pick recommendation system')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('recommend', help='top hero untuk pick/ban berikutnya')
+    add_state_arguments(p)
+    p.add_argument('-k', '--top', type=int, default=5)
+    p.add_argument('--json', action='store_true', help='output JSON')
+    p.add_argument('--csv', action='append', help='file CSV atau folder (boleh diulang)')
+    p.set_defaults(run=recommend)
+
+    p = commands.add_parser('build-snapshot', help='bangun (atau perbarui) snapshot model')
+    p.add_argument('--csv', action='append', help='file CSV atau folder (boleh diulang)')
+    p.add_argument('-j', '--workers', type=int, help='jumlah proses untuk banyak file CSV')
+    p.add_argument('--force', action='store_true', help='bangun ulang walaupun snapshot masih valid')
+    p.set_defaults(run=build_snapshot)
+
+    for name, (_, description) in DELEGATES.items():
+        p = commands.add_parser(name, help=description, add_help=False)
+        p.add_argument('rest', nargs=argparse.REMAINDER)
+        p.set_defaults(run=visualize if name == 'visualize' else delegate)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Argumen perintah delegasi (termasuk --help) diteruskan apa adanya
+    if argv and argv[0] in DELEGATES:
+        args = argparse.Namespace(command=argv[0], rest=argv[1:])
+        return (visualize if argv[0] == 'visualize' else delegate)(args)
+    args = build_parser().parse_args(argv)
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+import csv
+from collections import defaultdict
+from itertools import combinations
+from edge_index import top_edge_index
+from hero_graph import HeroGraph
+from matrix_stats import BAN_PHASES
+from profiling import stage
+
+def sinergi_edge_weight(h1, h2, stats, hero_stats):
+    win = stats['win']
+    lose = stats['lose']
+    base_weight = 0.6 * win + 0.3 * lose
+
+    if base_weight == 0:
+        # Use hero with fewer total picks
+        pick_i = hero_stats[h1]['pick_win'] + hero_stats[h1]['pick_lose']
+        pick_j = hero_stats[h2]['pick_win'] + hero_stats[h2]['pick_lose']
+        if pick_i == 0 and pick_j == 0:
+            return 0
+        elif pick_i == 0:
+            base_weight = 0.1 * (hero_stats[h1]['pick_win'] / 1)
+        elif pick_j == 0:
+            base_weight = 0.1 * (hero_stats[h2]['pick_win'] / 1)
+        else:
+            hero = h1 if pick_i < pick_j else h2
+            total_picks = hero_stats[hero]['pick_win'] + hero_stats[hero]['pick_lose']
+            if total_picks > 0:
+                winrate = hero_stats[hero]['pick_win'] / total_picks
+                base_weight = 0.1 * winrate
+
+    return base_weight
+
+
+@stage('build_sinergi_dasar_graph')
+def build_sinergi_dasar_graph(pair_wins, hero_stats):
+    G = HeroGraph()
+    for (h1, h2), stats in pair_wins.items():
+        base_weight = sinergi_edge_weight(h1, h2, stats, hero_stats)
+        if base_weight > 0:
+            G.add_edge(h1, h2, weight=base_weight)
+
+    return G
+
+
+def add_team_weights(team_weights, match):
+    # Bobot hero per tim dari satu match; team_weights[tim][hero]
+    for team_name, team_data in match['teams'].items():
+        enemy_team = [t for t in match['teams'] if t != team_name]
+        if not enemy_team:
+            continue
+        enemy_data = match['teams'][enemy_team[0]]
+        hero_team_weights = team_weights[team_name]
+
+        for hero in set(team_data['pick']):
+            if team_data['is_winner']:
+                hero_team_weights[hero] += 0.3
+            else:
+                hero_team_weights[hero] += 0.2
+
+        for hero in set(enemy_data['ban']):
+            hero_team_weights[hero] += 0.5
+
+
+def apply_team_weights(G_dasar, hero_team_weights):
+    # Setiap edge (node, neighbor) ditambah bobot tim node, untuk semua node
+    # di hero_team_weights; dihitung sekaligus di matriks bobot salinan G_dasar
+    return G_dasar.with_node_bonus(hero_team_weights)
+
+
+@stage('build_sinergi_tim_graph')
+def build_sinergi_tim_graph(G_dasar, hero_stats, team_name, matches):
+    team_weights = defaultdict(lambda: defaultdict(float))
+
+    for match in matches:
+        if team_name not in match['teams']:
+            continue
+        add_team_weights(team_weights, match)
+
+    return apply_team_weights(G_dasar, team_weights[team_name])
+
+
+def team_hero_bonus(stats, team_name):
+    # Bonus per hero untuk satu tim, dibaca dari tabel bobot tim yang sudah
+    # dihitung sekali untuk semua tim (stats['team_weights'])
+    row = stats['team_index'].get(team_name)
+    if row is None:
+        return {}
+    weights = stats['team_weights'][row].tolist()
+    return {hero: w for hero, w in zip(stats['heroes'], weights) if w}
+
+
+def team_synergy_weight(G_dasar, hero_bonus, u, v):
+    # Sama dengan bobot edge di G_tim tanpa perlu menyalin G_dasar
+    weight = G_dasar[u][v]['weight'] + hero_bonus.get(u, 0.0)
+    if u != v:
+        weight += hero_bonus.get(v, 0.0)
+    return weight
+
+
+def counter_edge(h1, h2, stats):
+    # Arah edge: hero yang menang lebih sering -> hero yang dikalahkan
+    score = stats['win'] - stats['lose']
+    if score > 0:
+        return h1, h2, score
+    elif score < 0:
+        return h2, h1, -score
+    return None
+
+
+@stage('build_counter_graph')
+def build_counter_graph_simple(versus):
+    G = HeroGraph(directed=True)
+    for (h1, h2), stats in versus.items():
+        edge = counter_edge(h1, h2, stats)
+        if edge is not None:
+            G.add_edge(edge[0], edge[1], weight=edge[2])
+    return G
+
+
+@stage('get_top_edges')
+def get_top_edges(G, top_k=50):
+    return top_edge_index(G).top(top_k)
+
+
+def aggregate_match(t1_data, t2_data, hero_stats, pair_wins, versus):
+    for team_data in [t1_data, t2_data]:
+        for hero in team_data['ban']:
+            hero_stats[hero]['banned'] += 1
+        for hero in team_data['pick']:
+            if team_data['is_winner']:
+                hero_stats[hero]['pick_win'] += 1
+            else:
+                hero_stats[hero]['pick_lose'] += 1
+
+    for team_data in [t1_data, t2_data]:
+        picks = team_data['pick']
+        for h1, h2 in combinations(sorted(picks), 2):
+            pair = tuple(sorted((h1, h2)))
+            pair_wins[pair]['freq'] += 1
+            if team_data['is_winner']:
+                pair_wins[pair]['win'] += 1
+            else:
+                pair_wins[pair]['lose'] += 1
+
+    for h1 in t1_data['pick']:
+        for h2 in t2_data['pick']:
+            if t1_data['is_winner']:
+                versus[(h1, h2)]['win'] += 1
+            else:
+                versus[(h1, h2)]['lose'] += 1
+    for h1 in t2_data['pick']:
+        for h2 in t1_data['pick']:
+            if t2_data['is_winner']:
+                versus[(h1, h2)]['win'] += 1
+            else:
+                versus[(h1, h2)]['lose'] += 1
+
+
+# Re-process data with extra matches info
+@stage('parse_csv')
+def process_csv_with_matches(filename):
+    team_picks = defaultdict(list)
+    hero_stats = defaultdict(lambda: {'pick_win': 0, 'pick_lose': 0, 'banned': 0})
+    pair_wins = defaultdict(lambda: {'win': 0, 'lose': 0, 'freq': 0})
+    versus = defaultdict(lambda: {'win': 0, 'lose': 0})
+    matches = []
+
+    with open(filename, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        match_data = defaultdict(lambda: {'teams': defaultdict(dict)})
+
+        for row in reader:
+            match_id = row['match_id']
+            team = row['team']
+            hero = row['hero'].strip().lower()
+            is_winner = int(row['is_winner'])
+            action = row['action_type']
+
+            match = match_data[match_id]
+            if team not in match['teams']:
+                match['teams'][team] = {'pick': [], 'ban': [], 'is_winner': is_winner}
+
+            if action == 'pick':
+                match['teams'][team]['pick'].append(hero)
+            elif action == 'ban':
+                match['teams'][team]['ban'].append(hero)
+
+        for match_id, match in match_data.items():
+            teams = list(match['teams'].keys())
+            if len(teams) != 2:
+                continue
+            t1, t2 = teams
+            t1_data = match['teams'][t1]
+            t2_data = match['teams'][t2]
+
+            # Store match
+            matches.append({'teams': {t1: t1_data, t2: t2_data}})
+            aggregate_match(t1_data, t2_data, hero_stats, pair_wins, versus)
+
+    return hero_stats, pair_wins, versus, matches
+
+
+def iter_csv_matches(filename, ban_phase=False):
+    # Membaca CSV baris per baris dan menghasilkan satu match begitu barisnya
+    # selesai. Baris satu match harus berurutan (seperti CSV yang ditambah per
+    # match selesai). Hanya match_id sebelumnya yang diingat (memori tetap), jadi
+    # match_id yang muncul lagi setelah match lain tidak bisa digabung. Potongan
+    # match yang tidak punya tepat dua tim (tanda match_id terpecah) ditolak
+    # dengan ValueError; gunakan process_csv_with_matches untuk CSV acak.
+    with open(filename, newline='', encoding='utf-8') as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, None)
+        if header is None:
+            return
+        col = {name: i for i, name in enumerate(header)}
+        i_match, i_team = col['match_id'], col['team']
+        i_action, i_hero, i_winner = col['action_type'], col['hero'], col['is_winner']
+        # ban_phase=True: fase tiap ban dari kolom 'lane', seperti matrix_stats.read_match_data
+        i_lane = col.get('lane') if ban_phase else None
+
+        current_id = None
+        teams = {}
+        for line, row in enumerate(reader, 2):
+            if not row:
+                continue
+            match_id = row[i_match]
+            if match_id != current_id:
+                if current_id is not None:
+                    yield _streamed_match(filename, current_id, start, teams)
+                current_id = match_id
+                start = line
+                teams = {}
+
+            team = row[i_team]
+            if team not in teams:
+                teams[team] = {'pick': [], 'ban': [], 'is_winner': int(row[i_winner])}
+                if ban_phase:
+                    teams[team]['ban_phase'] = []
+            action = row[i_action]
+            if action == 'pick' or action == 'ban':
+                teams[team][action].append(row[i_hero].strip().lower())
+            if action == 'ban' and ban_phase:
+                phase = row[i_lane].strip().lower() if i_lane is not None and i_lane < len(row) else ''
+                teams[team]['ban_phase'].append(BAN_PHASES.index(phase) if phase in BAN_PHASES else -1)
+
+        if current_id is not None:
+            yield _streamed_match(filename, current_id, start, teams)
+
+
+def _streamed_match(filename, match_id, line, teams):
+    if len(teams) != 2:
+        raise ValueError(f"{filename} baris {line}: match_id {match_id} punya {len(teams)} tim (harus 2); "
+                         f"baris match ini tidak berurutan di CSV.")
+    return {'teams': teams}
+
+
+@stage('parse_csv_streaming')
+def process_csv_streaming(filename):
+    # Seperti process_csv_with_matches, tetapi setiap match langsung diagregasi
+    # lalu dibuang. Memori sebanding dengan jumlah hero, bukan jumlah baris.
+    # Sebagai ganti `matches`, dikembalikan ringkasan bobot per tim
+    # (team_weights[tim][hero]) yang cukup untuk apply_team_weights.
+    hero_stats = defaultdict(lambda: {'pick_win': 0, 'pick_lose': 0, 'banned': 0})
+    pair_wins = defaultdict(lambda: {'win': 0, 'lose': 0, 'freq': 0})
+    versus = defaultdict(lambda: {'win': 0, 'lose': 0})
+    team_weights = defaultdict(lambda: defaultdict(float))
+
+    for match in iter_csv_matches(filename):
+        t1_data, t2_data = match['teams'].values()
+        aggregate_match(t1_data, t2_data, hero_stats, pair_wins, versus)
+        add_team_weights(team_weights, match)
+
+    return hero_stats, pair_wins, versus, team_weights
+
+
+def build_graphs(hero_stats, pair_wins, versus):
+    G_dasar = build_sinergi_dasar_graph(pair_wins, hero_stats)
+    G_counter = build_counter_graph_simple(versus)
+    return G_dasar, G_counter
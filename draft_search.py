@@ -0,0 +1,247 @@
+import argparse
+import math
+import time
+import numpy as np
+from draft_sequence import DRAFT_ORDER, add_state_arguments, check_turn, locate_step, state_from_args
+from main import DEFAULT_CSV, free_lane_mask, hero_lane_masks, load_model
+from scoring import get_score_matrices, synergy_all
+
+# Pencarian lookahead (minimax + alpha-beta) atas sisa fase pick/ban.
+#
+# Nilai draft dari sudut pandang tim kita:
+#   V = sum_{h di pick kita} sinergi_kita[h] - sum_{h di pick lawan} sinergi_lawan[h]
+#       + 2 * sum_{h di pick kita, e di pick lawan} (C[h, e] - C[e, h])
+# sinergi_* adalah bagian sinergi dari hero_value (dengan bonus tim), C adalah
+# bobot G_counter. V hanya bergantung pada himpunan pick, sehingga bisa
+# dijumlahkan per langkah dan disimpan di transposition table per state kanonik.
+# Di ujung horizon (depth habis sebelum draft selesai) nilai ditambah perkiraan
+# sisa pick: setiap pick yang tersisa diisi hero dengan pick_gain terbesar sisi
+# itu, sehingga ban di awal draft tetap bisa dibandingkan.
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class DraftSearch:
+    def __init__(self, model, state, width=6, time_budget=25.0):
+        stats = model['stats']
+        self.heroes = stats['heroes']
+        self.hero_index = stats['hero_index']
+        m = get_score_matrices(model)
+        self.delta = m['counter_delta']
+        self.our_side, self.root_step = locate_step(state)
+        self.their_side = 'B' if self.our_side == 'A' else 'A'
+        self.synergy = {
+            self.our_side: synergy_all(model, state['team']),
+            self.their_side: synergy_all(model, state['enemy']),
+        }
+        self.width = width
+        self.deadline = time.perf_counter() + time_budget
+        self.nodes = 0
+        self.table = {}
+
+        ids = lambda heroes: [self.hero_index[h] for h in heroes if h in self.hero_index]
+        self.picks = {self.our_side: ids(state['our_picks']), self.their_side: ids(state['enemy_picks'])}
+        self.bans = ids(state['our_bans']) + ids(state['enemy_bans'])
+        self.available = m['candidates'].copy()
+        self.available[self.picks['A'] + self.picks['B'] + self.bans] = False
+        self.pick_count = {
+            side: np.bincount(self.picks[side], minlength=len(self.heroes)).astype(np.float64)
+            for side in ('A', 'B')
+        }
+        self.lane_masks = [hero_lane_masks.get(h, 0) for h in self.heroes]
+
+    def key(self, step):
+        return (frozenset(self.picks['A']), frozenset(self.picks['B']),
+                frozenset(self.bans), step)
+
+    def free_lanes(self, side):
+        return free_lane_mask(frozenset(self.heroes[h] for h in self.picks[side]))
+
+    def pick_gain(self, side):
+        # Tambahan nilai untuk sisi `side` jika memilih tiap hero
+        opponent = 'B' if side == 'A' else 'A'
+        return self.synergy[side] + 2 * (self.delta @ self.pick_count[opponent])
+
+    def leaf_value(self, step):
+        # Perkiraan nilai sisa pick mulai `step` (ban yang tersisa diabaikan)
+        remaining = [side for side, action in DRAFT_ORDER[step:] if action == 'pick']
+        gains, candidates = {}, {}
+        for side in set(remaining):
+            gains[side] = self.pick_gain(side)
+            free = self.free_lanes(side)
+            order = np.flatnonzero(self.available)[np.argsort(-gains[side][self.available], kind='stable')]
+            candidates[side] = iter([h for h in order.tolist() if not self.lane_masks[h] or self.lane_masks[h] & free])
+        taken = set()
+        total = 0.0
+        for side in remaining:
+            for hero in candidates[side]:
+                if hero not in taken:
+                    taken.add(hero)
+                    total += gains[side][hero] if side == self.our_side else -gains[side][hero]
+                    break
+        return total
+
+    def moves(self, side, action, hint=None):
+        # Daftar (hero, perubahan nilai dari sudut pandang kita), terurut
+        opponent = 'B' if side == 'A' else 'A'
+        if action == 'pick':
+            gain = self.pick_gain(side)
+            order = gain
+        else:
+            # Ban: hero yang paling berharga bagi lawan
+            gain = None
+            order = self.pick_gain(opponent)
+        sign = 1.0 if side == self.our_side else -1.0
+        free = self.free_lanes(side if action == 'pick' else opponent)
+
+        moves = []
+        for hero in np.flatnonzero(self.available)[np.argsort(-order[self.available], kind='stable')].tolist():
+            lanes = self.lane_masks[hero]
+            if lanes and not lanes & free:
+                continue
+            moves.append((hero, sign * gain[hero] if gain is not None else 0.0))
+            if len(moves) >= self.width:
+                break
+        if hint is not None and hint not in [h for h, _ in moves] and self.available[hint]:
+            moves.insert(0, (hint, sign * gain[hint] if gain is not None else 0.0))
+        elif hint is not None:
+            moves.sort(key=lambda m: m[0] != hint)
+        return moves
+
+    def apply(self, side, action, hero):
+        self.available[hero] = False
+        if action == 'pick':
+            self.picks[side].append(hero)
+            self.pick_count[side][hero] += 1
+        else:
+            self.bans.append(hero)
+
+    def undo(self, side, action, hero):
+        self.available[hero] = True
+        if action == 'pick':
+            self.picks[side].pop()
+            self.pick_count[side][hero] -= 1
+        else:
+            self.bans.pop()
+
+    def search(self, step, depth, alpha, beta, value):
+        self.nodes += 1
+        if self.nodes % 256 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        if step >= len(DRAFT_ORDER):
+            return value
+        if depth == 0:
+            return value + self.leaf_value(step)
+
+        key = self.key(step)
+        entry = self.table.get(key)
+        hint = None
+        if entry is not None:
+            entry_depth, entry_value, flag, hint = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return entry_value
+                if flag == LOWER:
+                    alpha = max(alpha, entry_value)
+                elif flag == UPPER:
+                    beta = min(beta, entry_value)
+                if alpha >= beta:
+                    return entry_value
+
+        side, action = DRAFT_ORDER[step]
+        moves = self.moves(side, action, hint)
+        if not moves:
+            return self.search(step + 1, depth, alpha, beta, value)
+
+        maximizing = side == self.our_side
+        alpha0, beta0 = alpha, beta
+        best_value = -math.inf if maximizing else math.inf
+        best_move = None
+        for hero, gain in moves:
+            self.apply(side, action, hero)
+            try:
+                child = self.search(step + 1, depth - 1, alpha, beta, value + gain)
+            finally:
+                self.undo(side, action, hero)
+            if (maximizing and child > best_value) or (not maximizing and child < best_value):
+                best_value, best_move = child, hero
+            if maximizing:
+                alpha = max(alpha, best_value)
+            else:
+                beta = min(beta, best_value)
+            if alpha >= beta:
+                break
+
+        if best_value <= alpha0:
+            flag = UPPER
+        elif best_value >= beta0:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (depth, best_value, flag, best_move)
+        return best_value
+
+    def run(self, max_depth=6):
+        side, action = DRAFT_ORDER[self.root_step]
+        root_moves = self.moves(side, action)
+        results = [(hero, gain) for hero, gain in root_moves]
+        completed = 0
+        for depth in range(1, max_depth + 1):
+            scored = []
+            try:
+                for hero, gain in root_moves:
+                    self.apply(side, action, hero)
+                    try:
+                        value = self.search(self.root_step + 1, depth - 1, -math.inf, math.inf, gain)
+                    finally:
+                        self.undo(side, action, hero)
+                    scored.append((hero, value))
+            except SearchTimeout:
+                break
+            # Urutkan langkah root berdasarkan hasil iterasi terakhir
+            results = sorted(scored, key=lambda x: x[1], reverse=True)
+            root_moves = [(hero, dict(root_moves)[hero]) for hero, _ in results]
+            completed = depth
+            if self.root_step + depth >= len(DRAFT_ORDER):
+                break
+        return results, completed
+
+
+def search_draft(model, state, depth=6, time_budget=25.0, width=6):
+    # Iterative deepening sampai `depth` langkah atau batas waktu habis
+    search = DraftSearch(model, state, width=width, time_budget=time_budget)
+    results, completed = search.run(depth)
+    return {
+        'moves': [(search.heroes[h], v) for h, v in results],
+        'depth': completed,
+        'nodes': search.nodes,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Lookahead draft recommendation (alpha-beta)')
+    add_state_arguments(parser)
+    parser.add_argument('--depth', type=int, default=6)
+    parser.add_argument('--time', type=float, default=25.0, help='batas waktu dalam detik')
+    parser.add_argument('--width', type=int, default=6, help='jumlah langkah yang dicoba per giliran')
+    parser.add_argument('--csv', action='append', help='file CSV atau folder (boleh diulang)')
+    args = parser.parse_args(argv)
+
+    state = state_from_args(args)
+    check_turn(parser, state)
+    start = time.perf_counter()
+    result = search_draft(load_model(args.csv or DEFAULT_CSV), state, args.depth, args.time, args.width)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nTop 5 hero recommendations for {args.action.upper()} "
+          f"(lookahead depth {result['depth']}, {result['nodes']} nodes, {elapsed:.2f}s):")
+    for hero, score in result['moves'][:5]:
+        print(f"{hero} : {score:.4f}")
+
+
+if __name__ == '__main__':
+    main()
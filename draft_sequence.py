@@ -0,0 +1,119 @@
+# Urutan draft turnamen (10 ban, 10 pick). 'A' adalah tim pertama di match,
+# 'B' tim kedua. CSV tidak menyimpan urutan asli, jadi pick/ban tiap tim
+# diambil sesuai urutan barisnya di CSV.
+DRAFT_ORDER = [
+    ('A', 'ban'), ('B', 'ban'), ('A', 'ban'), ('B', 'ban'), ('A', 'ban'), ('B', 'ban'),
+    ('A', 'pick'), ('B', 'pick'), ('B', 'pick'), ('A', 'pick'), ('A', 'pick'), ('B', 'pick'),
+    ('B', 'ban'), ('A', 'ban'), ('B', 'ban'), ('A', 'ban'),
+    ('B', 'pick'), ('A', 'pick'), ('A', 'pick'), ('B', 'pick'),
+]
+
+
+LIST_FIELDS = ('our_picks', 'our_bans', 'enemy_picks', 'enemy_bans')
+
+
+def empty_state(action, team, enemy):
+    return {
+        'action': action,
+        'team': team,
+        'enemy': enemy,
+        'our_picks': [],
+        'our_bans': [],
+        'enemy_picks': [],
+        'enemy_bans': [],
+    }
+
+
+def state_args(state):
+    # Argumen untuk rank_heroes(model, *state_args(state))
+    return (
+        state['action'], state['team'], state['enemy'],
+        state['our_picks'], state['our_bans'], state['enemy_picks'], state['enemy_bans'],
+    )
+
+
+def hero_list(value):
+    return [h.strip().lower() for h in value.split(',') if h.strip()]
+
+
+def add_state_arguments(parser):
+    # Argumen draft state yang sama untuk semua perintah CLI
+    parser.add_argument('action', choices=['pick', 'ban'])
+    parser.add_argument('team')
+    parser.add_argument('enemy')
+    parser.add_argument('--our-picks', default='')
+    parser.add_argument('--our-bans', default='')
+    parser.add_argument('--enemy-picks', default='')
+    parser.add_argument('--enemy-bans', default='')
+
+
+def state_from_args(args):
+    state = empty_state(args.action, args.team.strip().lower(), args.enemy.strip().lower())
+    for field in LIST_FIELDS:
+        state[field] = hero_list(getattr(args, field))
+    return state
+
+
+def locate_step(state):
+    # Cari sisi kita ('A'/'B') dan posisi langkah sekarang di DRAFT_ORDER
+    done = {
+        'pick': (len(state['our_picks']), len(state['enemy_picks'])),
+        'ban': (len(state['our_bans']), len(state['enemy_bans'])),
+    }
+    for side in ('A', 'B'):
+        counts = {('A', 'pick'): 0, ('A', 'ban'): 0, ('B', 'pick'): 0, ('B', 'ban'): 0}
+        for step in range(len(DRAFT_ORDER) + 1):
+            matches = all(
+                counts[(side, action)] == ours and counts[('B' if side == 'A' else 'A', action)] == theirs
+                for action, (ours, theirs) in done.items()
+            )
+            if matches and step < len(DRAFT_ORDER) and DRAFT_ORDER[step] == (side, state['action']):
+                return side, step
+            if step < len(DRAFT_ORDER):
+                counts[DRAFT_ORDER[step]] += 1
+    raise ValueError("Draft state tidak cocok dengan urutan draft (DRAFT_ORDER).")
+
+
+def check_turn(parser, state):
+    # Tolak state yang bukan giliran valid di DRAFT_ORDER lewat parser.error
+    try:
+        return locate_step(state)
+    except ValueError as e:
+        parser.error(f"{e} Giliran {state['action']} tidak mungkin dengan {len(state['our_picks'])} pick/"
+                     f"{len(state['our_bans'])} ban kita dan {len(state['enemy_picks'])} pick/"
+                     f"{len(state['enemy_bans'])} ban lawan.")
+
+
+def match_actions(match):
+    # Daftar (team, action, hero) sesuai DRAFT_ORDER; sisa aksi yang tidak
+    # muat di urutan standar ditaruh di akhir
+    teams = list(match['teams'].keys())
+    side = {'A': teams[0], 'B': teams[1]}
+    queues = {
+        (team, action): list(match['teams'][team][action])
+        for team in teams for action in ('ban', 'pick')
+    }
+    actions = []
+    for s, action in DRAFT_ORDER:
+        queue = queues[(side[s], action)]
+        if queue:
+            actions.append((side[s], action, queue.pop(0)))
+    for (team, action), queue in queues.items():
+        actions.extend((team, action, hero) for hero in queue)
+    return actions
+
+
+def match_draft_steps(match):
+    # Yield (state, hero) untuk setiap langkah: state adalah kondisi draft
+    # dari sudut pandang tim yang sedang beraksi, hero adalah pilihan aslinya
+    teams = list(match['teams'].keys())
+    done = {team: {'pick': [], 'ban': []} for team in teams}
+    for team, action, hero in match_actions(match):
+        enemy = teams[1] if team == teams[0] else teams[0]
+        state = empty_state(action, team, enemy)
+        state['our_picks'] = list(done[team]['pick'])
+        state['our_bans'] = list(done[team]['ban'])
+        state['enemy_picks'] = list(done[enemy]['pick'])
+        state['enemy_bans'] = list(done[enemy]['ban'])
+        yield state, hero
+        done[team][action].append(hero)
@@ -0,0 +1,88 @@
+import heapq
+import weakref
+
+# Indeks top-k edge berdasarkan bobot untuk graf sinergi, tim dan counter.
+# Indeks dibangun saat pertama kali diminta (heapify O(E)), lalu setiap query
+# top-k hanya mengambil k elemen teratas dari heap: O(k log E).
+# Perubahan bobot dicatat lewat edge_changed(); entri lama dibuang secara
+# lazy ketika muncul di puncak heap. HeroGraph memanggil edge_changed() sendiri
+# di add_edge/remove_edge/G[u][v]['weight'] = w.
+# Indeks hanya menyimpan weakref ke graf, supaya graf (kunci _indexes) tetap
+# bisa di-garbage-collect bersama indeksnya.
+
+_indexes = weakref.WeakKeyDictionary()
+
+
+class TopEdgeIndex:
+    def __init__(self, G):
+        self._graph = weakref.ref(G)
+        self.directed = G.is_directed()
+        self.heap = []
+        self.live = {}
+        self.order = {}
+        self.version = 0
+        for u, v, d in G.edges(data=True):
+            self._push(u, v, d['weight'])
+        heapq.heapify(self.heap)
+
+    @property
+    def G(self):
+        return self._graph()
+
+    def _key(self, u, v):
+        return (u, v) if self.directed else frozenset((u, v))
+
+    def _push(self, u, v, weight, heap_push=False):
+        key = self._key(u, v)
+        # Urutan asli edge dipakai sebagai tie-breaker (sama seperti sorted yang stabil)
+        order = self.order.setdefault(key, len(self.order))
+        self.version += 1
+        self.live[key] = self.version
+        entry = (-weight, order, self.version, u, v)
+        if heap_push:
+            heapq.heappush(self.heap, entry)
+        else:
+            self.heap.append(entry)
+
+    def _valid(self, entry):
+        neg_weight, _, version, u, v = entry
+        return (self.live.get(self._key(u, v)) == version and self.G.has_edge(u, v)
+                and self.G[u][v]['weight'] == -neg_weight)
+
+    def edge_changed(self, u, v):
+        if self.G.has_edge(u, v):
+            self._push(u, v, self.G[u][v]['weight'], heap_push=True)
+        else:
+            self.live.pop(self._key(u, v), None)
+        # Bangun ulang heap jika entri basi sudah terlalu banyak
+        if len(self.heap) > 2 * len(self.live) + 64:
+            self.heap = [entry for entry in self.heap if self._valid(entry)]
+            heapq.heapify(self.heap)
+
+    def top(self, k):
+        result = []
+        taken = []
+        while self.heap and len(result) < k:
+            entry = heapq.heappop(self.heap)
+            if not self._valid(entry):
+                continue
+            taken.append(entry)
+            u, v = entry[3], entry[4]
+            result.append((u, v, self.G[u][v]))
+        for entry in taken:
+            heapq.heappush(self.heap, entry)
+        return result
+
+
+def top_edge_index(G):
+    index = _indexes.get(G)
+    if index is None:
+        index = _indexes[G] = TopEdgeIndex(G)
+    return index
+
+
+def edge_changed(G, u, v):
+    # Dipanggil setelah edge (u, v) ditambah, diubah bobotnya, atau dihapus
+    index = _indexes.get(G)
+    if index is not None:
+        index.edge_changed(u, v)
@@ -1,161 +1,30 @@
-import csv
-from collections import defaultdict
-from itertools import combinations
-import networkx as nx
-import matplotlib.pyplot as plt
-
-def process_csv_with_matches(filename):
-    hero_stats = defaultdict(lambda: {'pick_win': 0, 'pick_lose': 0, 'banned': 0})
-    pair_wins = defaultdict(lambda: {'win': 0, 'lose': 0, 'freq': 0})
-    versus = defaultdict(lambda: {'win': 0, 'lose': 0})
-    matches = []
-
-    with open(filename, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        match_data = defaultdict(lambda: {'teams': defaultdict(dict)})
-
-        for row in reader:
-            match_id = row['match_id']
-            team = row['team']
-            hero = row['hero'].strip().lower()
-            is_winner = int(row['is_winner'])
-            action = row['action_type']
-
-            match = match_data[match_id]
-            if team not in match['teams']:
-                match['teams'][team] = {'pick': [], 'ban': [], 'is_winner': is_winner}
-
-            if action == 'pick':
-                match['teams'][team]['pick'].append(hero)
-            elif action == 'ban':
-                match['teams'][team]['ban'].append(hero)
-
-        for match_id, match in match_data.items():
-            teams = list(match['teams'].keys())
-            if len(teams) != 2:
-                continue
-            t1, t2 = teams
-            t1_data = match['teams'][t1]
-            t2_data = match['teams'][t2]
-
-            matches.append({'teams': {t1: t1_data, t2: t2_data}})
-
-            for team_data in [t1_data, t2_data]:
-                for hero in team_data['ban']:
-                    hero_stats[hero]['banned'] += 1
-                for hero in team_data['pick']:
-                    if team_data['is_winner']:
-                        hero_stats[hero]['pick_win'] += 1
-                    else:
-                        hero_stats[hero]['pick_lose'] += 1
-
-            for team_data in [t1_data, t2_data]:
-                picks = team_data['pick']
-                for h1, h2 in combinations(sorted(picks), 2):
-                    pair = tuple(sorted((h1, h2)))
-                    pair_wins[pair]['freq'] += 1
-                    if team_data['is_winner']:
-                        pair_wins[pair]['win'] += 1
-                    else:
-                        pair_wins[pair]['lose'] += 1
-
-            for h1 in t1_data['pick']:
-                for h2 in t2_data['pick']:
-                    if t1_data['is_winner']:
-                        versus[(h1, h2)]['win'] += 1
-                    else:
-                        versus[(h1, h2)]['lose'] += 1
-            for h1 in t2_data['pick']:
-                for h2 in t1_data['pick']:
-                    if t2_data['is_winner']:
-                        versus[(h1, h2)]['win'] += 1
-                    else:
-                        versus[(h1, h2)]['lose'] += 1
-
-    return hero_stats, pair_wins, versus, matches
-
-def build_sinergi_dasar_graph(pair_wins, hero_stats):
-    G = nx.Graph()
-    for (h1, h2), stats in pair_wins.items():
-        win = stats['win']
-        lose = stats['lose']
-        total = win + lose
-        base_weight = 0.6 * win + 0.3 * lose
-
-        if base_weight == 0:
-            # Use hero with fewer total picks
-            pick_i = hero_stats[h1]['pick_win'] + hero_stats[h1]['pick_lose']
-            pick_j = hero_stats[h2]['pick_win'] + hero_stats[h2]['pick_lose']
-            if pick_i == 0 and pick_j == 0:
-                continue
-            elif pick_i == 0:
-                base_weight = 0.1 * (hero_stats[h1]['pick_win'] / 1)
-            elif pick_j == 0:
-                base_weight = 0.1 * (hero_stats[h2]['pick_win'] / 1)
-            else:
-                hero = h1 if pick_i < pick_j else h2
-                total_picks = hero_stats[hero]['pick_win'] + hero_stats[hero]['pick_lose']
-                if total_picks > 0:
-                    winrate = hero_stats[hero]['pick_win'] / total_picks
-                    base_weight = 0.1 * winrate
-
-        if base_weight > 0:
-            G.add_edge(h1, h2, weight=base_weight)
-
-    return G
-
-def build_sinergi_tim_graph(G_dasar, hero_stats, team_name, matches):
-    hero_team_weights = defaultdict(float)
-
-    for match in matches:
-        if team_name not in match['teams']:
-            continue
-        team_data = match['teams'][team_name]
-        enemy_team = [t for t in match['teams'] if t != team_name]
-        if not enemy_team:
-            continue
-        enemy_data = match['teams'][enemy_team[0]]
-
-        for hero in set(team_data['pick']):
-            if team_data['is_winner']:
-                hero_team_weights[hero] += 0.3
-            else:
-                hero_team_weights[hero] += 0.2
-
-        for hero in set(enemy_data['ban']):
-            hero_team_weights[hero] += 0.5
-
-    G_tim = G_dasar.copy()
-
-    for node in G_tim.nodes:
-        if node in hero_team_weights:
-            for neighbor in G_tim.neighbors(node):
-                if G_tim.has_edge(node, neighbor):
-                    G_tim[node][neighbor]['weight'] += hero_team_weights[node]
-
-    return G_tim
-
-def build_counter_graph_simple(versus):
-    G = nx.DiGraph()
-    for (h1, h2), stats in versus.items():
-        win = stats['win']
-        lose = stats['lose']
-        score = win - lose
-        if score > 0:
-            G.add_edge(h1, h2, weight=score)
-        elif score < 0:
-            G.add_edge(h2, h1, weight=-score)
-    return G
+import argparse
+import hashlib
+import os
+import sys
+from main import DEFAULT_CSV, load_model
+from profiling import query, stage
 
+# NetworkX, matplotlib dan numpy di-import di dalam fungsi: menu dan argumen
+# CLI sudah bisa tampil sebelum library grafik dimuat.
 
+LAYOUT_CACHE_DIR = '.layout_cache'
+
+
+@query('visualize')
 def visualize_graph(G, is_directed=False, top_k=None):
+    import matplotlib.pyplot as plt
+    import networkx as nx
+    from draft_graph import get_top_edges
+    from hero_graph import as_networkx
     if top_k is not None:
-        sorted_edges = sorted(G.edges(data=True), key=lambda x: x[2]['weight'], reverse=True)
-        G = G.__class__()  # create new empty graph of same type
-        for u, v, d in sorted_edges[:top_k]:
+        top_edges = get_top_edges(G, top_k)
+        G = nx.DiGraph() if G.is_directed() else nx.Graph()  # create new empty graph of same type
+        for u, v, d in top_edges:
             G.add_edge(u, v, weight=d['weight'])
 
-    pos = nx.spring_layout(G, seed=42)
+    G = as_networkx(G)
+    pos = layout_graph(G)
     weights = [d['weight'] for (_, _, d) in G.edges(data=True)]
     nx.draw(G, pos, with_labels=True, node_color='lightblue', node_size=1000, edge_color=weights,
             edge_cmap=plt.cm.plasma, width=2.5)
@@ -163,11 +32,154 @@ def visualize_graph(G, is_directed=False, top_k=None):
     nx.draw_networkx_edge_labels(G, pos, edge_labels={k: f"{v:.1f}" for k, v in labels.items()})
     plt.show()
 
+@stage('spring_layout')
+def layout_graph(G, cache_dir=None, seed=42):
+    # Layout di-cache di disk per graf (node, edge dan bobot), sehingga graf
+    # yang sama tidak perlu dihitung ulang spring_layout-nya
+    import networkx as nx
+    import numpy as np
+    if cache_dir is None:
+        return nx.spring_layout(G, seed=seed)
+
+    path = os.path.join(cache_dir, layout_key(G, seed) + '.npz')
+    if os.path.exists(path):
+        cached = np.load(path, allow_pickle=False)
+        return dict(zip(cached['nodes'].tolist(), cached['pos']))
+
+    pos = nx.spring_layout(G, seed=seed)
+    nodes = list(pos)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = path + '.tmp.npz'
+    np.savez(tmp_path, nodes=np.array(nodes, dtype=str),
+             pos=np.array([pos[n] for n in nodes], dtype=np.float64).reshape(-1, 2))
+    os.replace(tmp_path, path)
+    return pos
+
+def layout_key(G, seed):
+    digest = hashlib.sha256()
+    digest.update(f"{type(G).__name__}|{seed}|".encode())
+    digest.update(repr(sorted(map(str, G.nodes()))).encode())
+    edges = sorted((str(u), str(v), round(d.get('weight', 1.0), 9)) for u, v, d in G.edges(data=True))
+    digest.update(repr(edges).encode())
+    return digest.hexdigest()[:32]
+
+def communities_of(G):
+    # Komunitas hero (Louvain), diurutkan dari yang terbesar
+    import networkx as nx
+    undirected = G.to_undirected() if G.is_directed() else G
+    groups = nx.community.louvain_communities(undirected, weight='weight', seed=42)
+    return sorted((sorted(c) for c in groups), key=lambda c: (-len(c), c[0]))
+
+@stage('filter_graph')
+def filter_graph(G, min_weight=None, top_k=None, community=None):
+    # Saring edge sebelum layout: bobot minimum, top-k edge, dan/atau satu komunitas
+    import networkx as nx
+    from draft_graph import get_top_edges
+    if top_k is not None:
+        edges = get_top_edges(G, top_k)
+    else:
+        edges = G.edges(data=True)
+    H = nx.DiGraph() if G.is_directed() else nx.Graph()
+    H.add_edges_from((u, v, {'weight': d['weight']}) for u, v, d in edges
+                     if min_weight is None or d['weight'] >= min_weight)
+    if community is not None:
+        groups = communities_of(H)
+        if not 0 <= community < len(groups):
+            raise ValueError(f"Komunitas {community} tidak ada (hanya {len(groups)} komunitas).")
+        H = H.subgraph(groups[community]).copy()
+    return H
+
+@query('render_large')
+def render_large_graph(G, output=None, min_weight=None, top_k=None, community=None,
+                       node_labels=True, cache_dir=LAYOUT_CACHE_DIR, figsize=(16, 16), dpi=150):
+    # Mode render untuk graf besar: edge digambar sekaligus dalam satu
+    # LineCollection, tanpa label per edge. Jika `output` diisi (.png/.svg),
+    # gambar disimpan tanpa membuka jendela (headless).
+    import numpy as np
+    from matplotlib.collections import LineCollection
+    from matplotlib.figure import Figure
+    H = filter_graph(G, min_weight=min_weight, top_k=top_k, community=community)
+    pos = layout_graph(H, cache_dir=cache_dir)
+    nodes = list(H.nodes())
+    xy = np.array([pos[n] for n in nodes], dtype=np.float64).reshape(-1, 2)
+    index = {n: i for i, n in enumerate(nodes)}
+
+    edges = list(H.edges(data='weight'))
+    segments = np.array([[xy[index[u]], xy[index[v]]] for u, v, _ in edges], dtype=np.float64).reshape(-1, 2, 2)
+    weights = np.array([w for _, _, w in edges], dtype=np.float64)
+
+    if output is not None:
+        fig = Figure(figsize=figsize, dpi=dpi)
+    else:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=figsize, dpi=dpi)
+    ax = fig.add_subplot()
+    ax.set_axis_off()
+
+    lines = LineCollection(segments, array=weights, cmap='plasma',
+                           linewidths=0.5 + 2.0 * _normalize(weights), alpha=0.7)
+    ax.add_collection(lines)
+
+    colors = 'lightblue'
+    if nodes and H.number_of_edges():
+        membership = {n: i for i, group in enumerate(communities_of(H)) for n in group}
+        colors = [membership.get(n, 0) for n in nodes]
+    ax.scatter(xy[:, 0], xy[:, 1], s=60, c=colors, cmap='tab20', zorder=2)
+    if node_labels:
+        for n, (x, y) in zip(nodes, xy):
+            ax.text(x, y, str(n), fontsize=6, ha='center', va='bottom', zorder=3)
+    ax.autoscale_view()
+    if len(weights):
+        fig.colorbar(lines, ax=ax, shrink=0.6, label='weight')
+
+    if output is not None:
+        fig.savefig(output, bbox_inches='tight')
+        return output
+    plt.show()
+
+def _normalize(values):
+    import numpy as np
+    if not len(values) or values.max() == values.min():
+        return np.zeros_like(values)
+    return (values - values.min()) / (values.max() - values.min())
+
+def load_graphs(filename):
+    model = load_model(filename)
+    return model['hero_stats'], model['matches'], model['G_dasar'], model['G_counter']
+
+def export_main(argv=None):
+    parser = argparse.ArgumentParser(description='Render graf draft ke PNG/SVG (mode graf besar)')
+    parser.add_argument('graph', choices=['dasar', 'tim', 'counter'])
+    parser.add_argument('output', nargs='+', help='file output, format dari ekstensi (.png/.svg)')
+    parser.add_argument('--csv', action='append', help='file CSV atau folder (boleh diulang)')
+    parser.add_argument('--team', help='nama tim untuk graf tim')
+    parser.add_argument('--min-weight', type=float)
+    parser.add_argument('--top', type=int, help='hanya X edge teratas')
+    parser.add_argument('--community', type=int, help='hanya komunitas ke-N (0 = terbesar)')
+    parser.add_argument('--no-labels', action='store_true')
+    parser.add_argument('--layout-cache', default=LAYOUT_CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    from draft_graph import build_sinergi_tim_graph
+    hero_stats, matches, G_dasar, G_counter = load_graphs(args.csv or DEFAULT_CSV)
+    if args.graph == 'dasar':
+        G = G_dasar
+    elif args.graph == 'tim':
+        if not args.team:
+            parser.error('--team wajib untuk graf tim')
+        G = build_sinergi_tim_graph(G_dasar, hero_stats, args.team.strip().lower(), matches)
+    else:
+        G = G_counter
+
+    for output in args.output:
+        render_large_graph(G, output=output, min_weight=args.min_weight, top_k=args.top,
+                           community=args.community, node_labels=not args.no_labels,
+                           cache_dir=args.layout_cache)
+        print(f"Saved {output}")
+
 def main():
-    filename = r'd:\Matdis Learning Folder\Makalah matdis\data_draft.csv'
-    hero_stats, pair_wins, versus, matches = process_csv_with_matches(filename)
-    G_dasar = build_sinergi_dasar_graph(pair_wins, hero_stats)
-    G_counter = build_counter_graph_simple(versus)
+    from draft_graph import build_sinergi_tim_graph
+    hero_stats, matches, G_dasar, G_counter = load_graphs(DEFAULT_CSV)
 
     print("\nChoose graph to visualize:")
     print("1. Global Synergy Graph")
@@ -192,7 +204,8 @@ def main():
     print("\nDisplay options:")
     print("1. Show all edges")
     print("2. Show top X edges")
-    mode = input("Enter choice (1/2): ").strip()
+    print("3. Large graph mode (no edge labels, cached layout)")
+    mode = input("Enter choice (1/2/3): ").strip()
 
     if mode == '1':
         visualize_graph(G, is_directed=is_directed)
@@ -202,8 +215,19 @@ def main():
             visualize_graph(G, is_directed=is_directed, top_k=x)
         except:
             print("Invalid X.")
+    elif mode == '3':
+        try:
+            text = input("Minimum edge weight (kosongkan untuk semua): ").strip()
+            min_weight = float(text) if text else None
+        except ValueError:
+            print("Invalid weight.")
+            return
+        render_large_graph(G, min_weight=min_weight)
     else:
         print("Invalid display choice.")
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        export_main()
+    else:
+        main()
@@ -0,0 +1,367 @@
+from collections.abc import MutableMapping
+import numpy as np
+from edge_index import edge_changed, top_edge_index
+
+# Graf hero berbasis array, pengganti nx.Graph/nx.DiGraph untuk G_dasar,
+# G_tim dan G_counter. Hero di-intern menjadi id integer, bobot edge disimpan
+# di matriks padat (n x n), bukan satu dict Python per edge.
+#
+# API-nya mengikuti bagian NetworkX yang dipakai di repo ini (nodes, edges,
+# neighbors, has_edge, G[u][v]['weight'], add_edge, remove_edge, copy), termasuk
+# urutan iterasi node dan edge (urutan penambahan), sehingga hasil rekomendasi
+# dan urutan top-k tidak berubah. copy() berbagi array dengan graf asal dan
+# baru menyalin saat salah satunya diubah (copy-on-write).
+# Untuk visualisasi, to_networkx() membangun graf NetworkX biasa.
+
+
+class _EdgeData(MutableMapping):
+    # Pengganti dict atribut edge NetworkX; hanya atribut 'weight'
+    __slots__ = ('G', 'i', 'j')
+
+    def __init__(self, G, i, j):
+        self.G, self.i, self.j = G, i, j
+
+    def __getitem__(self, key):
+        if key != 'weight':
+            raise KeyError(key)
+        return self.G._weight[self.i, self.j].item()
+
+    def __setitem__(self, key, value):
+        if key != 'weight':
+            raise KeyError(key)
+        self.G._set_weight(self.i, self.j, value)
+        edge_changed(self.G, self.G.heroes[self.i], self.G.heroes[self.j])
+
+    def __delitem__(self, key):
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(('weight',))
+
+    def __len__(self):
+        return 1
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class _AdjacencyView:
+    __slots__ = ('G', 'i')
+
+    def __init__(self, G, i):
+        self.G, self.i = G, i
+
+    def __getitem__(self, hero):
+        j = self.G.index.get(hero)
+        if j is None or not self.G._present[self.i, j]:
+            raise KeyError(hero)
+        return _EdgeData(self.G, self.i, j)
+
+    def __contains__(self, hero):
+        j = self.G.index.get(hero)
+        return j is not None and bool(self.G._present[self.i, j])
+
+    def __iter__(self):
+        return iter(self.G._neighbor_names(self.i))
+
+    def __len__(self):
+        return int(self.G._present[self.i].sum())
+
+
+class HeroGraph:
+    def __init__(self, directed=False, heroes=None, dtype=np.float64):
+        self.directed = directed
+        self.dtype = np.dtype(dtype)
+        self.heroes = list(heroes or [])
+        self.index = {hero: i for i, hero in enumerate(self.heroes)}
+        capacity = max(len(self.heroes), 8)
+        self._weight = np.zeros((capacity, capacity), dtype=self.dtype)
+        self._present = np.zeros((capacity, capacity), dtype=bool)
+        # Urutan penambahan edge/node, untuk meniru urutan iterasi NetworkX
+        self._edge_seq = np.zeros((capacity, capacity), dtype=np.int32)
+        self._node_seq = np.full(capacity, -1, dtype=np.int64)
+        self._counter = 0
+        self._n_edges = 0
+        self._shared_structure = False
+        self._shared_weight = False
+
+    # --- penyimpanan ---
+
+    def _own_structure(self):
+        if self._shared_structure:
+            self.heroes = list(self.heroes)
+            self.index = dict(self.index)
+            self._present = self._present.copy()
+            self._edge_seq = self._edge_seq.copy()
+            self._node_seq = self._node_seq.copy()
+            self._shared_structure = False
+
+    def _own_weight(self):
+        if self._shared_weight:
+            self._weight = self._weight.copy()
+            self._shared_weight = False
+
+    def _grow(self, n):
+        capacity = len(self._node_seq)
+        if n <= capacity:
+            return
+        new_capacity = max(n, 2 * capacity)
+        for name, fill in (('_weight', 0), ('_present', False), ('_edge_seq', 0)):
+            old = getattr(self, name)
+            grown = np.full((new_capacity, new_capacity), fill, dtype=old.dtype)
+            grown[:capacity, :capacity] = old
+            setattr(self, name, grown)
+        node_seq = np.full(new_capacity, -1, dtype=np.int64)
+        node_seq[:capacity] = self._node_seq
+        self._node_seq = node_seq
+        self._shared_structure = self._shared_weight = False
+
+    def _intern(self, hero):
+        i = self.index.get(hero)
+        if i is None:
+            self._own_structure()
+            i = self.index[hero] = len(self.heroes)
+            self.heroes.append(hero)
+            self._grow(len(self.heroes))
+        return i
+
+    def _add_node_id(self, i):
+        if self._node_seq[i] < 0:
+            self._own_structure()
+            self._node_seq[i] = self._counter
+            self._counter += 1
+
+    def _set_weight(self, i, j, value):
+        self._own_weight()
+        self._weight[i, j] = value
+        if not self.directed:
+            self._weight[j, i] = value
+
+    def _node_ids(self):
+        n = len(self.heroes)
+        ids = np.flatnonzero(self._node_seq[:n] >= 0)
+        return ids[np.argsort(self._node_seq[ids], kind='stable')]
+
+    def _neighbor_ids(self, i):
+        ids = np.flatnonzero(self._present[i, :len(self.heroes)])
+        return ids[np.argsort(self._edge_seq[i, ids], kind='stable')]
+
+    def _neighbor_names(self, i):
+        return [self.heroes[j] for j in self._neighbor_ids(i).tolist()]
+
+    def edge_arrays(self, insertion_order=False):
+        # (i, j, bobot) semua edge dalam urutan iterasi G.edges(), atau urutan
+        # penambahan (from_arrays dengan urutan ini juga mempertahankan urutan neighbors)
+        n = len(self.heroes)
+        position = np.full(n, n, dtype=np.int64)
+        nodes = self._node_ids()
+        position[nodes] = np.arange(len(nodes))
+        rows, cols = np.nonzero(self._present[:n, :n])
+        if not self.directed:
+            # Seperti NetworkX: edge {u, v} muncul sekali, dari node yang lebih dulu
+            keep = position[cols] >= position[rows]
+            rows, cols = rows[keep], cols[keep]
+        if insertion_order:
+            order = np.argsort(self._edge_seq[rows, cols], kind='stable')
+        else:
+            order = np.lexsort((self._edge_seq[rows, cols], position[rows]))
+        rows, cols = rows[order], cols[order]
+        return rows, cols, self._weight[rows, cols]
+
+    # --- API ala NetworkX ---
+
+    def is_directed(self):
+        return self.directed
+
+    @property
+    def nodes(self):
+        return [self.heroes[i] for i in self._node_ids().tolist()]
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __contains__(self, hero):
+        i = self.index.get(hero)
+        return i is not None and self._node_seq[i] >= 0
+
+    def __len__(self):
+        return int((self._node_seq[:len(self.heroes)] >= 0).sum())
+
+    def number_of_nodes(self):
+        return len(self)
+
+    def number_of_edges(self):
+        return self._n_edges
+
+    def has_node(self, hero):
+        return hero in self
+
+    def has_edge(self, u, v):
+        i, j = self.index.get(u), self.index.get(v)
+        return i is not None and j is not None and bool(self._present[i, j])
+
+    def neighbors(self, hero):
+        i = self.index.get(hero)
+        if i is None or self._node_seq[i] < 0:
+            raise KeyError(hero)
+        return iter(self._neighbor_names(i))
+
+    successors = neighbors
+
+    def __getitem__(self, hero):
+        i = self.index.get(hero)
+        if i is None or self._node_seq[i] < 0:
+            raise KeyError(hero)
+        return _AdjacencyView(self, i)
+
+    def weight(self, u, v, default=None):
+        i, j = self.index.get(u), self.index.get(v)
+        if i is None or j is None or not self._present[i, j]:
+            return default
+        return self._weight[i, j].item()
+
+    def edges(self, data=False):
+        rows, cols, weights = self.edge_arrays()
+        heroes = self.heroes
+        pairs = zip((heroes[i] for i in rows.tolist()), (heroes[j] for j in cols.tolist()))
+        if data is False:
+            return list(pairs)
+        if data is True:
+            return [(u, v, {'weight': w}) for (u, v), w in zip(pairs, weights.tolist())]
+        if data == 'weight':
+            return [(u, v, w) for (u, v), w in zip(pairs, weights.tolist())]
+        return [(u, v, None) for u, v in pairs]
+
+    def add_node(self, hero):
+        self._add_node_id(self._intern(hero))
+
+    def add_nodes_from(self, heroes):
+        for hero in heroes:
+            self.add_node(hero)
+
+    def add_edge(self, u, v, weight=1.0):
+        i = self._intern(u)
+        j = self._intern(v)
+        self._add_node_id(i)
+        self._add_node_id(j)
+        if not self._present[i, j]:
+            self._own_structure()
+            self._present[i, j] = True
+            self._edge_seq[i, j] = self._counter
+            if not self.directed:
+                self._present[j, i] = True
+                self._edge_seq[j, i] = self._counter
+            self._counter += 1
+            self._n_edges += 1
+        self._set_weight(i, j, weight)
+        edge_changed(self, u, v)
+
+    def add_weighted_edges_from(self, edges):
+        for u, v, w in edges:
+            self.add_edge(u, v, weight=w)
+
+    def remove_edge(self, u, v):
+        if not self.has_edge(u, v):
+            raise KeyError(f"Edge {u}-{v} tidak ada di graf.")
+        i, j = self.index[u], self.index[v]
+        self._own_structure()
+        self._own_weight()
+        self._present[i, j] = False
+        self._weight[i, j] = 0
+        if not self.directed:
+            self._present[j, i] = False
+            self._weight[j, i] = 0
+        self._n_edges -= 1
+        edge_changed(self, u, v)
+
+    def copy(self):
+        G = HeroGraph.__new__(HeroGraph)
+        G.__dict__.update(self.__dict__)
+        G._shared_structure = G._shared_weight = True
+        self._shared_structure = self._shared_weight = True
+        return G
+
+    # --- operasi array ---
+
+    @classmethod
+    def from_arrays(cls, heroes, nodes, u, v, w, directed=False, dtype=np.float64):
+        # Sama dengan add_nodes_from(nodes) lalu add_weighted_edges_from(u, v, w),
+        # dengan id hero = posisi di `heroes`
+        G = cls(directed=directed, heroes=heroes, dtype=dtype)
+        nodes = np.asarray(nodes, dtype=np.int64)
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        G._node_seq[nodes] = np.arange(len(nodes))
+        seq = np.arange(len(nodes), len(nodes) + len(u))
+        G._present[u, v] = True
+        G._edge_seq[u, v] = seq
+        G._weight[u, v] = w
+        if not directed:
+            G._present[v, u] = True
+            G._edge_seq[v, u] = seq
+            G._weight[v, u] = w
+        G._counter = len(nodes) + len(u)
+        G._n_edges = len(u)
+        return G
+
+    def dense(self, heroes):
+        # Matriks bobot dan adjacency (float64) dengan urutan baris/kolom `heroes`
+        ids = np.array([self.index.get(hero, -1) for hero in heroes], dtype=np.int64)
+        known = ids >= 0
+        weight = np.zeros((len(heroes), len(heroes)), dtype=np.float64)
+        present = np.zeros((len(heroes), len(heroes)), dtype=bool)
+        sub = np.ix_(ids[known], ids[known])
+        inner = np.ix_(known, known)
+        present[inner] = self._present[sub]
+        weight[inner] = np.where(self._present[sub], self._weight[sub], 0.0)
+        return weight, present
+
+    def node_positions(self, heroes):
+        # Posisi tiap hero di urutan G.nodes (len(heroes) jika bukan node)
+        position = {self.heroes[i]: p for p, i in enumerate(self._node_ids().tolist())}
+        return np.array([position.get(hero, len(heroes)) for hero in heroes], dtype=np.int64)
+
+    def with_node_bonus(self, bonus):
+        # Salinan graf dengan bobot edge (u, v) ditambah bonus[u] + bonus[v]
+        # (self-loop hanya sekali), sama seperti apply_team_weights; penjumlahan
+        # mengikuti urutan node agar hasil float identik
+        G = self.copy()
+        n = len(self.heroes)
+        b = np.zeros(n, dtype=np.float64)
+        for hero, value in bonus.items():
+            i = self.index.get(hero)
+            if i is not None and self._node_seq[i] >= 0:
+                b[i] = value
+        present = self._present[:n, :n]
+        rank = np.where(self._node_seq[:n] >= 0, self._node_seq[:n], np.iinfo(np.int64).max)
+        first_is_row = rank[:, None] <= rank[None, :]
+        first = np.where(first_is_row, b[:, None], b[None, :])
+        second = np.where(first_is_row, b[None, :], b[:, None])
+        if self.directed:
+            weight = self._weight[:n, :n] + b[:, None]
+        else:
+            weight = self._weight[:n, :n] + first
+            np.fill_diagonal(second, 0.0)
+            weight = weight + second
+        G._weight = self._weight.copy()
+        G._weight[:n, :n] = np.where(present, weight, self._weight[:n, :n]).astype(self.dtype)
+        G._shared_weight = False
+        return G
+
+    def top_edges(self, k):
+        return top_edge_index(self).top(k)
+
+    @property
+    def nbytes(self):
+        return self._weight.nbytes + self._present.nbytes + self._edge_seq.nbytes + self._node_seq.nbytes
+
+    def to_networkx(self):
+        import networkx as nx
+        G = nx.DiGraph() if self.directed else nx.Graph()
+        G.add_nodes_from(self.nodes)
+        G.add_weighted_edges_from(self.edges(data='weight'))
+        return G
+
+
+def as_networkx(G):
+    return G.to_networkx() if isinstance(G, HeroGraph) else G
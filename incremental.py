@@ -0,0 +1,272 @@
+from itertools import combinations
+import numpy as np
+from draft_graph import counter_edge, sinergi_edge_weight
+
+# Update model secara inkremental ketika match baru masuk.
+# Model adalah dict dari snapshot.load_or_build_snapshot; setiap match hanya
+# menyentuh hero, pasangan hero dan tim yang terlibat di match tersebut.
+# Match divalidasi dulu sebelum model diubah, sehingga counter, graf, daftar
+# matches dan tabel match per sisi selalu bertambah bersama-sama.
+
+SIDE_ARRAYS = ('side_team', 'side_win', 'side_picks', 'side_bans', 'side_ban_phase')
+COUNTER_ARRAYS = (
+    'pick_win', 'pick_lose', 'banned',
+    'pair_win', 'pair_lose', 'versus_win', 'versus_lose', 'team_weights',
+)
+
+
+def _make_writable(stats):
+    # Array dari snapshot di-memory-map read-only, salin sekali sebelum diubah
+    for name in COUNTER_ARRAYS:
+        if not stats[name].flags.writeable:
+            stats[name] = np.array(stats[name])
+    for name in ('pair_order', 'versus_order'):
+        if not isinstance(stats[name], list):
+            stats[name] = stats[name].tolist()
+
+
+def _grow_heroes(stats, n_heroes):
+    old = stats['pick_win'].shape[0]
+    if n_heroes <= old:
+        return
+    for name in ('pick_win', 'pick_lose', 'banned'):
+        grown = np.zeros(n_heroes, dtype=stats[name].dtype)
+        grown[:old] = stats[name]
+        stats[name] = grown
+    for name in ('pair_win', 'pair_lose', 'versus_win', 'versus_lose'):
+        grown = np.zeros((n_heroes, n_heroes), dtype=stats[name].dtype)
+        grown[:old, :old] = stats[name]
+        stats[name] = grown
+    grown = np.zeros((stats['team_weights'].shape[0], n_heroes), dtype=np.float64)
+    grown[:, :old] = stats['team_weights']
+    stats['team_weights'] = grown
+    # Kunci urutan pasangan dikodekan sebagai a * n_heroes + b
+    for name in ('pair_order', 'versus_order'):
+        stats[name] = [(k // old) * n_heroes + k % old for k in stats[name]] if old else []
+
+
+def _grow_teams(stats, n_teams):
+    old = stats['team_weights'].shape[0]
+    if n_teams <= old:
+        return
+    grown = np.zeros((n_teams, stats['team_weights'].shape[1]), dtype=np.float64)
+    grown[:old] = stats['team_weights']
+    stats['team_weights'] = grown
+
+
+def _intern(stats, match):
+    heroes, hero_index = stats['heroes'], stats['hero_index']
+    teams, team_index = stats['teams'], stats['team_index']
+    for team, team_data in match['teams'].items():
+        if team not in team_index:
+            team_index[team] = len(teams)
+            teams.append(team)
+        for hero in team_data['ban'] + team_data['pick']:
+            if hero not in hero_index:
+                hero_index[hero] = len(heroes)
+                heroes.append(hero)
+    _grow_heroes(stats, len(heroes))
+    _grow_teams(stats, len(teams))
+
+
+def _side_buffers(stats):
+    # Tabel match disimpan di buffer dengan kapasitas berlipat; stats[name] hanya
+    # view baris yang terisi, jadi menambah match tidak menyalin seluruh tabel.
+    # Buffer dibuat ulang (sekali) jika tabel di stats bukan view dari buffer ini,
+    # misalnya tepat setelah load snapshot.
+    buffers = stats.get('side_buffers')
+    rows = len(stats['side_team'])
+    if (buffers is None or buffers['rows'] != rows
+            or any(stats[name].base is not buffers[name] for name in SIDE_ARRAYS)):
+        buffers = {'rows': rows}
+        for name in SIDE_ARRAYS:
+            buffers[name] = _grow_buffer(stats[name], rows, max(2 * rows, 64))
+        stats['side_buffers'] = buffers
+    return buffers
+
+
+def _grow_buffer(arr, rows, capacity, width=0):
+    # Salin `rows` baris pertama ke buffer baru (baris/kolom sisa diisi -1)
+    if arr.ndim == 1:
+        out = np.full(capacity, -1, dtype=arr.dtype)
+        out[:rows] = arr[:rows]
+        return out
+    out = np.full((capacity, max(arr.shape[1], width)), -1, dtype=arr.dtype)
+    out[:rows, :arr.shape[1]] = arr[:rows]
+    return out
+
+
+def _append_sides(stats, new_rows):
+    # new_rows[name]: nilai (side_team/side_win) atau list id per sisi baru
+    buffers = _side_buffers(stats)
+    start = buffers['rows']
+    end = start + len(new_rows['side_team'])
+    bans_width = max([buffers['side_bans'].shape[1]] + [len(row) for row in new_rows['side_bans']])
+    for name in SIDE_ARRAYS:
+        buf = buffers[name]
+        width = bans_width if name == 'side_ban_phase' else (
+            max([buf.shape[1]] + [len(row) for row in new_rows[name]]) if buf.ndim == 2 else 0)
+        if end > len(buf) or (buf.ndim == 2 and width > buf.shape[1]):
+            capacity = max(end, 2 * len(buf)) if end > len(buf) else len(buf)
+            buf = buffers[name] = _grow_buffer(buf, start, capacity, width)
+        for i, row in enumerate(new_rows[name]):
+            if buf.ndim == 2:
+                buf[start + i, :len(row)] = row
+            else:
+                buf[start + i] = row
+        stats[name] = buf[:end]
+    buffers['rows'] = end
+
+
+def _update_sinergi_edge(model, h1, h2):
+    G_dasar = model['G_dasar']
+    weight = sinergi_edge_weight(h1, h2, model['pair_wins'][(h1, h2)], model['hero_stats'])
+    if weight > 0:
+        G_dasar.add_edge(h1, h2, weight=weight)
+    elif G_dasar.has_edge(h1, h2):
+        G_dasar.remove_edge(h1, h2)
+
+
+def _update_counter_edge(model, h1, h2):
+    G_counter = model['G_counter']
+    for u, v in ((h1, h2), (h2, h1)):
+        if G_counter.has_edge(u, v):
+            G_counter.remove_edge(u, v)
+    edge = counter_edge(h1, h2, model['versus'][(h1, h2)])
+    if edge is not None:
+        G_counter.add_edge(edge[0], edge[1], weight=edge[2])
+
+
+def _name(value):
+    # Sama seperti parser CSV dan parse_state
+    return value.strip().lower()
+
+
+def validate_match(match):
+    # Mengembalikan salinan match dengan nama tim/hero dinormalisasi
+    teams = match.get('teams') if isinstance(match, dict) else None
+    if not isinstance(teams, dict) or len(teams) != 2:
+        raise ValueError("Match harus berupa objek dengan tepat dua tim di 'teams'.")
+    normalized = {}
+    for team, team_data in teams.items():
+        if not isinstance(team, str) or not _name(team) or not isinstance(team_data, dict):
+            raise ValueError("Setiap tim harus berupa objek dengan nama tim sebagai key.")
+        for key in ('pick', 'ban'):
+            heroes = team_data.get(key)
+            if not isinstance(heroes, list) or not all(isinstance(h, str) and _name(h) for h in heroes):
+                raise ValueError(f"Tim {team}: '{key}' harus berupa list nama hero.")
+        is_winner = team_data.get('is_winner')
+        if not isinstance(is_winner, int) or is_winner not in (0, 1):
+            raise ValueError(f"Tim {team}: 'is_winner' harus 0 atau 1.")
+        # Opsional: fase tiap ban (0 = first, 1 = second, -1 = tidak tercatat)
+        phases = team_data.get('ban_phase', [])
+        if (not isinstance(phases, list) or len(phases) > len(team_data['ban'])
+                or not all(isinstance(p, int) and p in (-1, 0, 1) for p in phases)):
+            raise ValueError(f"Tim {team}: 'ban_phase' harus list 0/1/-1, tidak lebih panjang dari 'ban'.")
+        normalized[_name(team)] = {
+            'pick': [_name(h) for h in team_data['pick']],
+            'ban': [_name(h) for h in team_data['ban']],
+            'ban_phase': list(phases),
+            'is_winner': is_winner,
+        }
+
+    if len(normalized) != 2:
+        raise ValueError("Kedua tim dalam satu match harus berbeda.")
+    t1_data, t2_data = normalized.values()
+    if t1_data['is_winner'] == t2_data['is_winner']:
+        raise ValueError("Tepat satu tim harus punya 'is_winner' 1.")
+    picks = t1_data['pick'] + t2_data['pick']
+    if len(set(picks)) != len(picks):
+        raise ValueError("Hero yang sama tidak boleh di-pick dua kali dalam satu match.")
+    return {'teams': normalized}
+
+
+def add_match(model, match):
+    match = validate_match(match)
+    teams = list(match['teams'].keys())
+    stats = model['stats']
+    hero_stats, pair_wins, versus = model['hero_stats'], model['pair_wins'], model['versus']
+    _make_writable(stats)
+    _intern(stats, match)
+    hero_index = stats['hero_index']
+    n_heroes = len(stats['heroes'])
+    t1_data = match['teams'][teams[0]]
+    t2_data = match['teams'][teams[1]]
+
+    for team_data in [t1_data, t2_data]:
+        for hero in team_data['ban']:
+            hero_stats[hero]['banned'] += 1
+            stats['banned'][hero_index[hero]] += 1
+        for hero in team_data['pick']:
+            if team_data['is_winner']:
+                hero_stats[hero]['pick_win'] += 1
+                stats['pick_win'][hero_index[hero]] += 1
+            else:
+                hero_stats[hero]['pick_lose'] += 1
+                stats['pick_lose'][hero_index[hero]] += 1
+
+    touched_pairs = set()
+    for team_data in [t1_data, t2_data]:
+        counts = stats['pair_win'] if team_data['is_winner'] else stats['pair_lose']
+        for h1, h2 in combinations(sorted(team_data['pick']), 2):
+            pair = tuple(sorted((h1, h2)))
+            a, b = hero_index[pair[0]], hero_index[pair[1]]
+            if pair not in pair_wins:
+                stats['pair_order'].append(a * n_heroes + b)
+            pair_wins[pair]['freq'] += 1
+            pair_wins[pair]['win' if team_data['is_winner'] else 'lose'] += 1
+            counts[a, b] += 1
+            if a != b:
+                counts[b, a] += 1
+            touched_pairs.add(pair)
+
+    touched_versus = set()
+    for team_data, enemy_data in [(t1_data, t2_data), (t2_data, t1_data)]:
+        counts = stats['versus_win'] if team_data['is_winner'] else stats['versus_lose']
+        for h1 in team_data['pick']:
+            for h2 in enemy_data['pick']:
+                a, b = hero_index[h1], hero_index[h2]
+                if (h1, h2) not in versus:
+                    stats['versus_order'].append(a * n_heroes + b)
+                versus[(h1, h2)]['win' if team_data['is_winner'] else 'lose'] += 1
+                counts[a, b] += 1
+                touched_versus.add((h1, h2))
+
+    # Tabel bobot tim (lihat build_sinergi_tim_graph)
+    for team, team_data, enemy_data in [(teams[0], t1_data, t2_data), (teams[1], t2_data, t1_data)]:
+        weights = stats['team_weights'][stats['team_index'][team]]
+        for hero in set(team_data['pick']):
+            weights[hero_index[hero]] += 0.3 if team_data['is_winner'] else 0.2
+        for hero in set(enemy_data['ban']):
+            weights[hero_index[hero]] += 0.5
+
+    for h1, h2 in touched_pairs:
+        _update_sinergi_edge(model, h1, h2)
+    for h1, h2 in touched_versus:
+        _update_counter_edge(model, h1, h2)
+
+    # Dua baris tabel match untuk match ini (lihat matrix_stats.build_match_table)
+    sides = [t1_data, t2_data]
+    _append_sides(stats, {
+        'side_team': [stats['team_index'][t] for t in teams],
+        'side_win': [s['is_winner'] for s in sides],
+        'side_picks': [[hero_index[h] for h in s['pick']] for s in sides],
+        'side_bans': [[hero_index[h] for h in s['ban']] for s in sides],
+        'side_ban_phase': [s.get('ban_phase', []) for s in sides],
+    })
+
+    # Model dari snapshot membangun `matches` dari tabel match saat pertama diakses
+    if 'matches' in model:
+        model['matches'].append({'teams': {teams[0]: t1_data, teams[1]: t2_data}})
+    # Matriks skor (scoring.py) dibangun ulang saat dibutuhkan lagi, cache rekomendasi dikosongkan
+    model.pop('score_matrices', None)
+    model.pop('recommend_cache', None)
+    return True
+
+
+def add_matches(model, new_matches):
+    # Semua match dicek dulu: batch yang tidak valid ditolak tanpa mengubah model
+    new_matches = [validate_match(match) for match in new_matches]
+    for match in new_matches:
+        add_match(model, match)
+    return len(new_matches)
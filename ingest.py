@@ -0,0 +1,142 @@
+import glob
+import hashlib
+import os
+from multiprocessing import Pool
+import numpy as np
+from matrix_stats import _ordered_keys, aggregate_match_table, build_match_table, read_match_data
+from profiling import stage
+from snapshot import csv_hash
+
+# Ingestion banyak file CSV (misalnya satu per liga/season) sekaligus.
+# Setiap shard dibaca dan diagregasi di proses worker terpisah menjadi counter
+# matriks (aggregate_match_table) dengan id hero lokal. Proses utama hanya
+# memetakan id lokal ke id global lalu menjumlahkan matriksnya. Hasilnya sama
+# dengan process_csv_matrix atas gabungan semua file (match_id tiap file
+# dianggap terpisah, jadi id yang sama di liga berbeda tidak tercampur).
+
+HERO_ARRAYS = ('pick_win', 'pick_lose', 'banned')
+PAIR_ARRAYS = ('pair_win', 'pair_lose', 'versus_win', 'versus_lose')
+
+
+def expand_sources(paths):
+    # File CSV dan/atau folder (semua *.csv di dalamnya, termasuk subfolder)
+    if isinstance(paths, str):
+        paths = [paths]
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            found = sorted(glob.glob(os.path.join(path, '**', '*.csv'), recursive=True))
+            if not found:
+                raise ValueError(f"Tidak ada file CSV di folder {path}.")
+            files.extend(found)
+        else:
+            files.append(path)
+    return files
+
+
+def sources_hash(files):
+    digest = hashlib.sha256()
+    for filename in files:
+        digest.update(f"{os.path.basename(filename)}:{csv_hash(filename)}\n".encode())
+    return digest.hexdigest()
+
+
+def sources_snapshot_path(paths):
+    if isinstance(paths, str):
+        paths = [paths]
+    if len(paths) == 1:
+        return paths[0].rstrip('/\\') + '.snapshot'
+    key = hashlib.sha256('\n'.join(os.path.abspath(p) for p in paths).encode()).hexdigest()[:12]
+    return os.path.join(os.path.dirname(os.path.abspath(paths[0])), f'.draft-{key}.snapshot')
+
+
+def aggregate_shard(filename):
+    # Dijalankan di worker: tabel match dan counter dengan id hero/tim lokal
+    table = build_match_table(read_match_data(filename, ban_phase=True))
+    table.update(aggregate_match_table(table))
+    del table['hero_index'], table['team_index']
+    return table
+
+
+def _remap_rows(rows, ids, width):
+    out = np.full((len(rows), width), -1, dtype=np.int32)
+    out[:, :rows.shape[1]] = np.where(rows >= 0, ids[np.maximum(rows, 0)], -1)
+    return out
+
+
+def _widen_rows(rows, width):
+    out = np.full((len(rows), width), -1, dtype=np.int32)
+    out[:, :rows.shape[1]] = rows
+    return out
+
+
+def _remap_keys(keys, ids, n_local, n_heroes):
+    keys = np.asarray(keys, dtype=np.int64)
+    return ids[keys // n_local].astype(np.int64) * n_heroes + ids[keys % n_local]
+
+
+@stage('merge_shards')
+def merge_shards(shards):
+    heroes, hero_index = [], {}
+    teams, team_index = [], {}
+
+    def intern(names, index, items):
+        for name in names:
+            if name not in index:
+                index[name] = len(items)
+                items.append(name)
+        return np.array([index[name] for name in names], dtype=np.int64)
+
+    hero_ids = [intern(shard['heroes'], hero_index, heroes) for shard in shards]
+    team_ids = [intern(shard['teams'], team_index, teams) for shard in shards]
+    n_heroes = len(heroes)
+
+    stats = {'heroes': heroes, 'hero_index': hero_index, 'teams': teams, 'team_index': team_index}
+    for name in HERO_ARRAYS:
+        stats[name] = np.zeros(n_heroes, dtype=np.int64)
+    for name in PAIR_ARRAYS:
+        stats[name] = np.zeros((n_heroes, n_heroes), dtype=np.int64)
+
+    pick_width = max([shard['side_picks'].shape[1] for shard in shards], default=1)
+    ban_width = max([shard['side_bans'].shape[1] for shard in shards], default=1)
+    side_team, side_win, side_picks, side_bans, side_ban_phase = [], [], [], [], []
+    pair_order, versus_order = [], []
+    for shard, ids, t_ids in zip(shards, hero_ids, team_ids):
+        n_local = len(shard['heroes'])
+        for name in HERO_ARRAYS:
+            stats[name][ids] += shard[name]
+        for name in PAIR_ARRAYS:
+            stats[name][np.ix_(ids, ids)] += shard[name]
+        side_team.append(t_ids[shard['side_team']].astype(np.int32))
+        side_win.append(shard['side_win'])
+        side_picks.append(_remap_rows(shard['side_picks'], ids, pick_width))
+        side_bans.append(_remap_rows(shard['side_bans'], ids, ban_width))
+        side_ban_phase.append(_widen_rows(shard['side_ban_phase'], ban_width))
+        if n_local:
+            pair_order.append(_remap_keys(shard['pair_order'], ids, n_local, n_heroes))
+            versus_order.append(_remap_keys(shard['versus_order'], ids, n_local, n_heroes))
+
+    stats['side_team'] = np.concatenate(side_team) if side_team else np.zeros(0, dtype=np.int32)
+    stats['side_win'] = np.concatenate(side_win) if side_win else np.zeros(0, dtype=np.int32)
+    stats['side_picks'] = np.concatenate(side_picks) if side_picks else np.full((0, 1), -1, dtype=np.int32)
+    stats['side_bans'] = np.concatenate(side_bans) if side_bans else np.full((0, 1), -1, dtype=np.int32)
+    stats['side_ban_phase'] = (np.concatenate(side_ban_phase) if side_ban_phase
+                               else np.full((0, 1), -1, dtype=np.int32))
+    # Urutan pasangan = kemunculan pertama jika semua file dibaca berurutan
+    empty = np.zeros(0, dtype=np.int64)
+    stats['pair_order'] = _ordered_keys(np.concatenate(pair_order)) if pair_order else empty
+    stats['versus_order'] = _ordered_keys(np.concatenate(versus_order)) if versus_order else empty
+    return stats
+
+
+@stage('parse_shards')
+def process_csv_shards(paths, workers=None):
+    files = expand_sources(paths)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(files) == 1:
+        shards = [aggregate_shard(filename) for filename in files]
+    else:
+        with Pool(min(workers, len(files))) as pool:
+            shards = pool.map(aggregate_shard, files, chunksize=1)
+    # Daftar `matches` dibangun dari tabel match saat dibutuhkan (snapshot.DraftModel)
+    return merge_shards(shards)
@@ -1,185 +1,65 @@
-import csv
 import math
+import os
 from collections import defaultdict
-from itertools import combinations, product
-import networkx as nx
-
-def build_sinergi_dasar_graph(pair_wins, hero_stats):
-    G = nx.Graph()
-    for (h1, h2), stats in pair_wins.items():
-        win = stats['win']
-        lose = stats['lose']
-        total = win + lose
-        base_weight = 0.6 * win + 0.3 * lose
-
-        if base_weight == 0:
-            # Use hero with fewer total picks
-            pick_i = hero_stats[h1]['pick_win'] + hero_stats[h1]['pick_lose']
-            pick_j = hero_stats[h2]['pick_win'] + hero_stats[h2]['pick_lose']
-            if pick_i == 0 and pick_j == 0:
-                continue
-            elif pick_i == 0:
-                base_weight = 0.1 * (hero_stats[h1]['pick_win'] / 1)
-            elif pick_j == 0:
-                base_weight = 0.1 * (hero_stats[h2]['pick_win'] / 1)
-            else:
-                hero = h1 if pick_i < pick_j else h2
-                total_picks = hero_stats[hero]['pick_win'] + hero_stats[hero]['pick_lose']
-                if total_picks > 0:
-                    winrate = hero_stats[hero]['pick_win'] / total_picks
-                    base_weight = 0.1 * winrate
-
-        if base_weight > 0:
-            G.add_edge(h1, h2, weight=base_weight)
-
-    return G
-
-
-def build_sinergi_tim_graph(G_dasar, hero_stats, team_name, matches):
-    hero_team_weights = defaultdict(float)
-
-    for match in matches:
-        if team_name not in match['teams']:
-            continue
-        team_data = match['teams'][team_name]
-        enemy_team = [t for t in match['teams'] if t != team_name]
-        if not enemy_team:
-            continue
-        enemy_data = match['teams'][enemy_team[0]]
-
-        for hero in set(team_data['pick']):
-            if team_data['is_winner']:
-                hero_team_weights[hero] += 0.3
-            else:
-                hero_team_weights[hero] += 0.2
-
-        for hero in set(enemy_data['ban']):
-            hero_team_weights[hero] += 0.5
-
-    G_tim = G_dasar.copy()
-
-    for node in G_tim.nodes:
-        if node in hero_team_weights:
-            for neighbor in G_tim.neighbors(node):
-                if G_tim.has_edge(node, neighbor):
-                    G_tim[node][neighbor]['weight'] += hero_team_weights[node]
-
-    return G_tim
-
-
-def build_counter_graph_simple(versus):
-    G = nx.DiGraph()
-    for (h1, h2), stats in versus.items():
-        win = stats['win']
-        lose = stats['lose']
-        score = win - lose
-        if score > 0:
-            G.add_edge(h1, h2, weight=score)
-        elif score < 0:
-            G.add_edge(h2, h1, weight=-score)
-    return G
-
-
-def get_top_edges(G, top_k=50):
-    edges = sorted(G.edges(data=True), key=lambda x: x[2]['weight'], reverse=True)
-    return edges[:top_k]
-
-
-# Re-process data with extra matches info
-def process_csv_with_matches(filename):
-    team_picks = defaultdict(list)
-    hero_stats = defaultdict(lambda: {'pick_win': 0, 'pick_lose': 0, 'banned': 0})
-    pair_wins = defaultdict(lambda: {'win': 0, 'lose': 0, 'freq': 0})
-    versus = defaultdict(lambda: {'win': 0, 'lose': 0})
-    matches = []
-
-    with open(filename, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        match_data = defaultdict(lambda: {'teams': defaultdict(dict)})
-
-        for row in reader:
-            match_id = row['match_id']
-            team = row['team']
-            hero = row['hero'].strip().lower()
-            is_winner = int(row['is_winner'])
-            action = row['action_type']
-
-            match = match_data[match_id]
-            if team not in match['teams']:
-                match['teams'][team] = {'pick': [], 'ban': [], 'is_winner': is_winner}
-
-            if action == 'pick':
-                match['teams'][team]['pick'].append(hero)
-            elif action == 'ban':
-                match['teams'][team]['ban'].append(hero)
-
-        for match_id, match in match_data.items():
-            teams = list(match['teams'].keys())
-            if len(teams) != 2:
-                continue
-            t1, t2 = teams
-            t1_data = match['teams'][t1]
-            t2_data = match['teams'][t2]
-
-            # Store match
-            matches.append({'teams': {t1: t1_data, t2: t2_data}})
-
-            for team_data in [t1_data, t2_data]:
-                for hero in team_data['ban']:
-                    hero_stats[hero]['banned'] += 1
-                for hero in team_data['pick']:
-                    if team_data['is_winner']:
-                        hero_stats[hero]['pick_win'] += 1
-                    else:
-                        hero_stats[hero]['pick_lose'] += 1
-
-            for team_data in [t1_data, t2_data]:
-                picks = team_data['pick']
-                for h1, h2 in combinations(sorted(picks), 2):
-                    pair = tuple(sorted((h1, h2)))
-                    pair_wins[pair]['freq'] += 1
-                    if team_data['is_winner']:
-                        pair_wins[pair]['win'] += 1
-                    else:
-                        pair_wins[pair]['lose'] += 1
-
-            for h1 in t1_data['pick']:
-                for h2 in t2_data['pick']:
-                    if t1_data['is_winner']:
-                        versus[(h1, h2)]['win'] += 1
-                    else:
-                        versus[(h1, h2)]['lose'] += 1
-            for h1 in t2_data['pick']:
-                for h2 in t1_data['pick']:
-                    if t2_data['is_winner']:
-                        versus[(h1, h2)]['win'] += 1
-                    else:
-                        versus[(h1, h2)]['lose'] += 1
-
-    return hero_stats, pair_wins, versus, matches
-
-
-# Run full pipeline for sample team
-filename = r'd:\Matdis Learning Folder\Makalah matdis\data_draft.csv'
-hero_stats, pair_wins, versus, matches = process_csv_with_matches(filename)
-
-# Build graphs
-G_dasar = build_sinergi_dasar_graph(pair_wins, hero_stats)
-G_counter = build_counter_graph_simple(versus)
-G_tim = build_sinergi_tim_graph(G_dasar, hero_stats, "onic", matches)
-
-# Get top 50 edges
-top_dasar = get_top_edges(G_dasar, top_k=50)
-top_tim = get_top_edges(G_tim, top_k=50)
-top_counter = get_top_edges(G_counter, top_k=50)
-
-def hero_value(hero, team_graph, counter_graph, team_allies, enemy_heroes):
-    # Total sinergi value (sum of all edges connected to hero)
-    sinergi_val = sum(
-        team_graph[hero][nb]['weight'] for nb in team_graph.neighbors(hero)
-        if team_graph.has_edge(hero, nb)
+from functools import lru_cache
+from itertools import product
+from profiling import query, stage
+from recommend_cache import RecommendationCache, state_key
+
+# Modul berbasis numpy (graf, snapshot, scoring) di-import di dalam fungsi yang
+# memakainya, sehingga `import main` (misalnya untuk hero_to_lanes) tetap ringan.
+
+# Bisa diganti lewat DRAFT_DATA (file CSV atau folder berisi CSV per liga/season)
+DEFAULT_CSV = os.environ.get('DRAFT_DATA') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data_draft.csv')
+
+
+def load_model(filename=DEFAULT_CSV, workers=None):
+    # Snapshot dimuat ulang dari disk, dan dibangun ulang hanya jika isi CSV berubah.
+    # `filename` boleh satu CSV, folder, atau list file/folder (lihat ingest.py)
+    from ingest import expand_sources, process_csv_shards, sources_hash, sources_snapshot_path
+    from snapshot import load_or_build_snapshot
+    filename = single_source(filename)
+    if isinstance(filename, str) and os.path.isfile(filename):
+        return load_or_build_snapshot(filename)
+    files = expand_sources(filename)
+    return load_or_build_snapshot(
+        files, path=sources_snapshot_path(filename), digest=sources_hash(files),
+        build_stats=lambda sources: process_csv_shards(sources, workers),
     )
 
+
+def single_source(filename):
+    # ['x.csv'] (dari --csv) sama dengan 'x.csv': snapshot dan hash yang sama
+    if not isinstance(filename, str) and len(filename) == 1 and os.path.isfile(filename[0]):
+        return filename[0]
+    return filename
+
+
+def model_snapshot_path(filename=DEFAULT_CSV):
+    # File snapshot yang dipakai load_model untuk sumber ini
+    from ingest import sources_snapshot_path
+    from snapshot import snapshot_path_for
+    filename = single_source(filename)
+    if isinstance(filename, str) and os.path.isfile(filename):
+        return snapshot_path_for(filename)
+    return sources_snapshot_path(filename)
+
+
+@stage('hero_value')
+def hero_value(hero, team_graph, counter_graph, team_allies, enemy_heroes, hero_bonus=None):
+    # Total sinergi value (sum of all edges connected to hero)
+    # Dengan hero_bonus, team_graph adalah G_dasar dan bobot tim dihitung langsung
+    if hero_bonus is not None:
+        from draft_graph import team_synergy_weight
+        sinergi_val = sum(
+            team_synergy_weight(team_graph, hero_bonus, hero, nb) for nb in team_graph.neighbors(hero)
+        )
+    else:
+        sinergi_val = sum(
+            team_graph[hero][nb]['weight'] for nb in team_graph.neighbors(hero)
+            if team_graph.has_edge(hero, nb)
+        )
+
     # Counter value
     counter_val = 0
     for enemy in enemy_heroes:
@@ -276,33 +156,56 @@ hero_to_lanes = {
 }
 # Example: hero_to_lanes['granger'] = {'gold'}, hero_to_lanes['chou'] = {'roam', 'exp'}
 
-def get_effective_lane_occupation(picked_heroes):
-    lane_count = defaultdict(int)
-    fixed_heroes = []
-    flexible_heroes = []
+# Lane sebagai bitmask: bit i = LANES[i]
+LANES = ('exp', 'gold', 'jungler', 'mid', 'roam')
+ALL_LANE_MASK = (1 << len(LANES)) - 1
+
+
+def lane_mask(lanes):
+    return sum(1 << i for i, lane in enumerate(LANES) if lane in lanes)
+
 
+hero_lane_masks = {hero: lane_mask(lanes) for hero, lanes in hero_to_lanes.items()}
+
+
+@lru_cache(maxsize=4096)
+def free_lane_mask(picked_heroes):
+    # Penempatan hero ke lane adalah matching bipartit (hero -> 5 lane).
+    # Simpan semua himpunan lane terisi (bitmask) dari matching maksimum;
+    # sebuah lane bebas jika kosong di salah satu matching tersebut.
+    # picked_heroes harus frozenset agar bisa di-cache.
+    assigned = {0: 0}
     for hero in picked_heroes:
-        lanes = hero_to_lanes.get(hero, set())
-        if len(lanes) == 1:
-            lane = next(iter(lanes))
-            lane_count[lane] += 1
-            fixed_heroes.append((hero, lanes))
-        elif len(lanes) > 1:
-            flexible_heroes.append((hero, lanes))
-
-    # Alokasikan hero fleksibel ke lane yang belum penuh
-    for hero, lanes in flexible_heroes:
-        for lane in sorted(lanes):  # prioritaskan berdasarkan urutan abjad
-            if lane_count[lane] == 0:
-                lane_count[lane] += 1
-                break
-
-    return set(lane_count.keys())
-
-def recommend_heroes(action_type, team_name, enemy_team, our_picks, our_bans, enemy_picks, enemy_bans):
-    team_graph = build_sinergi_tim_graph(G_dasar, hero_stats, team_name, matches)
-    enemy_graph = build_sinergi_tim_graph(G_dasar, hero_stats, enemy_team, matches)
+        hero_mask = hero_lane_masks.get(hero, 0)
+        if not hero_mask:
+            continue
+        next_assigned = dict(assigned)
+        for occupied, count in assigned.items():
+            options = hero_mask & ~occupied
+            while options:
+                bit = options & -options
+                options ^= bit
+                if next_assigned.get(occupied | bit, -1) < count + 1:
+                    next_assigned[occupied | bit] = count + 1
+        assigned = next_assigned
+
+    best = max(assigned.values())
+    free = 0
+    for occupied, count in assigned.items():
+        if count == best:
+            free |= ALL_LANE_MASK & ~occupied
+    return free
+
 
+def get_effective_lane_occupation(picked_heroes):
+    # Lane yang pasti terisi di setiap penempatan valid hero yang sudah dipick
+    free = free_lane_mask(frozenset(picked_heroes))
+    return {lane for i, lane in enumerate(LANES) if not free & (1 << i)}
+
+@stage('rank_heroes')
+def rank_heroes(model, action_type, team_name, enemy_team, our_picks, our_bans, enemy_picks, enemy_bans, top_n=5):
+    from scoring import top_candidates
+    heroes = model['stats']['heroes']
     picked_or_banned = set(our_picks + our_bans + enemy_picks + enemy_bans)
     # occupied_lanes = set()
     # enemy_occupied_lanes = set()
@@ -310,69 +213,105 @@ def recommend_heroes(action_type, team_name, enemy_team, our_picks, our_bans, en
     #     occupied_lanes.update(hero_to_lanes.get(hero, set()))
     # for hero in enemy_picks:
     #     enemy_occupied_lanes.update(hero_to_lanes.get(hero, set()))
-    occupied_lanes = get_effective_lane_occupation(our_picks)
-    enemy_occupied_lanes = get_effective_lane_occupation(enemy_picks)
-
-    scores = {}
-
-    for hero in G_dasar.nodes:
-        if hero in picked_or_banned:
-            continue
+    # Lane yang masih bisa diisi (bitmask), dicek O(1) per kandidat
+    free_lanes = free_lane_mask(frozenset(our_picks))
+    enemy_free_lanes = free_lane_mask(frozenset(enemy_picks))
+
+    # Skor hero_value, hanya untuk kandidat yang bisa masuk top_n (lihat scoring.top_candidates)
+    if action_type == 'pick':
+        scored = (team_name, enemy_picks, free_lanes)
+    elif action_type == 'ban':
+        scored = (enemy_team, our_picks, enemy_free_lanes)
+    else:
+        scored = None
 
-        if action_type == 'pick':
-            value = hero_value(hero, team_graph, G_counter, our_picks, enemy_picks)
-        elif action_type == 'ban':
-            value = hero_value(hero, enemy_graph, G_counter, enemy_picks, our_picks)
-        else:
-            continue
+    # Sort heroes by value descending
+    sorted_heroes = []
+    if scored is not None:
+        team, enemies, free = scored
+        accept = lambda h: not hero_lane_masks.get(heroes[h], 0) or bool(hero_lane_masks[heroes[h]] & free)
+        ranked, values = top_candidates(model, team, enemies, picked_or_banned, accept, top_n)
+        sorted_heroes = zip((heroes[h] for h in ranked.tolist()), values.tolist())
 
-        scores[hero] = value
+    return filter_by_lanes(sorted_heroes, action_type, picked_or_banned, free_lanes, enemy_free_lanes, top_n)
 
-    # Sort heroes by value descending
-    sorted_heroes = sorted(scores.items(), key=lambda x: x[1], reverse=True)
 
+@stage('lane_filter')
+def filter_by_lanes(sorted_heroes, action_type, picked_or_banned, free_lanes, enemy_free_lanes, top_n=5):
     # Filter top 5 based on lane availability and already picked/banned
     top_valid = []
+    if top_n <= 0:
+        return top_valid
     for hero, score in sorted_heroes:
         if hero in picked_or_banned:
             continue
-        lanes = hero_to_lanes.get(hero, set())
+        lanes = hero_lane_masks.get(hero, 0)
 
         if not lanes:
             top_valid.append((hero, score))
         elif action_type == 'pick':
-            if not lanes.isdisjoint({'exp', 'gold', 'mid', 'jungler', 'roam'} - occupied_lanes):
+            if lanes & free_lanes:
                 top_valid.append((hero, score))
         elif action_type == 'ban':
-            if len(lanes) == 1 and next(iter(lanes)) in enemy_occupied_lanes:
-                continue  # hero hanya bisa di 1 lane dan sudah diambil musuh
-            if not lanes <= enemy_occupied_lanes:
+            # hero yang tidak bisa lagi ditempatkan di lane musuh tidak perlu diban
+            if lanes & enemy_free_lanes:
                 top_valid.append((hero, score))
 
-        if len(top_valid) >= 5:
+        if len(top_valid) >= top_n:
             break
 
+    return top_valid
+
+
+def cached_rank_heroes(model, action_type, team_name, enemy_team, our_picks, our_bans, enemy_picks, enemy_bans,
+                       top_n=5, cache=None):
+    # rank_heroes dengan cache per draft state; tanpa `cache`, dipakai cache di
+    # model (dihapus oleh incremental.add_match saat data berubah)
+    if cache is None:
+        cache = model.get('recommend_cache')
+        if cache is None:
+            cache = model['recommend_cache'] = RecommendationCache()
+    key = state_key(action_type, team_name, enemy_team, our_picks, our_bans, enemy_picks, enemy_bans, top_n)
+    result = cache.get(key)
+    if result is None:
+        result = tuple(rank_heroes(model, action_type, team_name, enemy_team, our_picks, our_bans,
+                                   enemy_picks, enemy_bans, top_n))
+        cache.put(key, result)
+    return list(result)
+
+
+@query('recommend')
+def recommend_heroes(model, action_type, team_name, enemy_team, our_picks, our_bans, enemy_picks, enemy_bans):
+    top_valid = cached_rank_heroes(model, action_type, team_name, enemy_team, our_picks, our_bans, enemy_picks, enemy_bans)
+
     print(f"\nTop 5 hero recommendations for {action_type.upper()}:")
     for hero, score in top_valid:
         print(f"{hero} : {score:.4f}")
 
 
-# Example usage
-team_name = input("Masukkan nama tim kita: ").strip().lower()
-enemy_team = input("Masukkan nama tim lawan: ").strip().lower()
+def main():
+    model = load_model()
+
+    # Example usage
+    team_name = input("Masukkan nama tim kita: ").strip().lower()
+    enemy_team = input("Masukkan nama tim lawan: ").strip().lower()
+
+    print("Masukkan hero yang sudah kita PICK (pisah dengan koma):")
+    our_picks = [h.strip().lower() for h in input().split(',') if h.strip()]
+    print("Masukkan hero yang sudah kita BAN (pisah dengan koma):")
+    our_bans = [h.strip().lower() for h in input().split(',') if h.strip()]
+    print("Masukkan hero yang sudah DIPICK musuh:")
+    enemy_picks = [h.strip().lower() for h in input().split(',') if h.strip()]
+    print("Masukkan hero yang sudah DIBAN musuh:")
+    enemy_bans = [h.strip().lower() for h in input().split(',') if h.strip()]
+
+    # Combine all picked/banned to filter them out
+    picked_or_banned_total = set(our_picks + our_bans + enemy_picks + enemy_bans)
 
-print("Masukkan hero yang sudah kita PICK (pisah dengan koma):")
-our_picks = [h.strip().lower() for h in input().split(',') if h.strip()]
-print("Masukkan hero yang sudah kita BAN (pisah dengan koma):")
-our_bans = [h.strip().lower() for h in input().split(',') if h.strip()]
-print("Masukkan hero yang sudah DIPICK musuh:")
-enemy_picks = [h.strip().lower() for h in input().split(',') if h.strip()]
-print("Masukkan hero yang sudah DIBAN musuh:")
-enemy_bans = [h.strip().lower() for h in input().split(',') if h.strip()]
+    act = input("Apakah ini tahap PICK atau BAN? (pick/ban): ").strip().lower()
 
-# Combine all picked/banned to filter them out
-picked_or_banned_total = set(our_picks + our_bans + enemy_picks + enemy_bans)
+    recommend_heroes(model, act, team_name, enemy_team, our_picks, our_bans, enemy_picks, enemy_bans)
 
-act = input("Apakah ini tahap PICK atau BAN? (pick/ban): ").strip().lower()
 
-recommend_heroes(act, team_name, enemy_team, our_picks, our_bans, enemy_picks, enemy_bans)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import csv
+from collections import defaultdict
+import numpy as np
+from profiling import stage
+
+# Aggregasi statistik draft berbasis matriks.
+# Hero dipetakan ke id integer (urutan kemunculan pertama), lalu hero_stats,
+# pair_wins dan versus dihitung sekaligus dengan operasi array atas seluruh
+# tabel match, bukan loop Python per pasangan hero.
+
+# Isi kolom 'lane' untuk baris ban; fase disimpan sebagai indeks (0/1),
+# -1 jika tidak tercatat
+BAN_PHASES = ('first', 'second')
+
+
+@stage('parse_csv_matrix')
+def read_match_data(filename, ban_phase=False):
+    # ban_phase=True: setiap tim juga punya 'ban_phase', fase tiap ban di 'ban'
+    match_data = defaultdict(lambda: {'teams': defaultdict(dict)})
+
+    with open(filename, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            match_id = row['match_id']
+            team = row['team']
+            hero = row['hero'].strip().lower()
+            is_winner = int(row['is_winner'])
+            action = row['action_type']
+
+            match = match_data[match_id]
+            if team not in match['teams']:
+                match['teams'][team] = {'pick': [], 'ban': [], 'is_winner': is_winner}
+                if ban_phase:
+                    match['teams'][team]['ban_phase'] = []
+
+            if action == 'pick':
+                match['teams'][team]['pick'].append(hero)
+            elif action == 'ban':
+                match['teams'][team]['ban'].append(hero)
+                if ban_phase:
+                    phase = (row.get('lane') or '').strip().lower()
+                    match['teams'][team]['ban_phase'].append(BAN_PHASES.index(phase) if phase in BAN_PHASES else -1)
+
+    matches = []
+    for match_id, match in match_data.items():
+        teams = list(match['teams'].keys())
+        if len(teams) != 2:
+            continue
+        t1, t2 = teams
+        matches.append({'teams': {t1: match['teams'][t1], t2: match['teams'][t2]}})
+    return matches
+
+
+def _pad(rows, width):
+    out = np.full((len(rows), max(width, 1)), -1, dtype=np.int32)
+    for i, row in enumerate(rows):
+        out[i, :len(row)] = row
+    return out
+
+
+# Jumlah baris sisi yang dikumpulkan sebagai list Python sebelum diubah ke array
+TABLE_CHUNK = 1 << 16
+
+
+def build_match_table(matches):
+    # Satu baris per sisi tim: baris 2m dan 2m+1 adalah dua tim di match m.
+    # `matches` boleh generator; baris dikonversi ke array per TABLE_CHUNK sisi
+    heroes = []
+    hero_index = {}
+    teams = []
+    team_index = {}
+    rows = {'side_team': [], 'side_win': [], 'side_picks': [], 'side_bans': [], 'side_ban_phase': []}
+    chunks = {name: [] for name in rows}
+
+    def hero_id(hero):
+        if hero not in hero_index:
+            hero_index[hero] = len(heroes)
+            heroes.append(hero)
+        return hero_index[hero]
+
+    def flush():
+        width = max(map(len, rows['side_bans']), default=0)
+        chunks['side_team'].append(np.array(rows['side_team'], dtype=np.int32))
+        chunks['side_win'].append(np.array(rows['side_win'], dtype=np.int32))
+        chunks['side_picks'].append(_pad(rows['side_picks'], max(map(len, rows['side_picks']), default=0)))
+        chunks['side_bans'].append(_pad(rows['side_bans'], width))
+        # Sejajar dengan side_bans: fase tiap ban (lihat read_match_data)
+        chunks['side_ban_phase'].append(_pad(rows['side_ban_phase'], width))
+        for values in rows.values():
+            values.clear()
+
+    for match in matches:
+        for team, team_data in match['teams'].items():
+            if team not in team_index:
+                team_index[team] = len(teams)
+                teams.append(team)
+            rows['side_team'].append(team_index[team])
+            rows['side_win'].append(team_data['is_winner'])
+            rows['side_bans'].append([hero_id(h) for h in team_data['ban']])
+            rows['side_picks'].append([hero_id(h) for h in team_data['pick']])
+            rows['side_ban_phase'].append(team_data.get('ban_phase', []))
+        if len(rows['side_team']) >= TABLE_CHUNK:
+            flush()
+    if rows['side_team'] or not chunks['side_team']:
+        flush()
+
+    table = {'heroes': heroes, 'hero_index': hero_index, 'teams': teams, 'team_index': team_index}
+    for name, parts in chunks.items():
+        if parts[0].ndim == 1:
+            table[name] = np.concatenate(parts)
+            continue
+        width = max(part.shape[1] for part in (chunks['side_bans'] if name == 'side_ban_phase' else parts))
+        table[name] = np.concatenate([_pad_width(part, width) for part in parts])
+    return table
+
+
+def _pad_width(arr, width):
+    if arr.shape[1] == width:
+        return arr
+    out = np.full((len(arr), width), -1, dtype=arr.dtype)
+    out[:, :arr.shape[1]] = arr
+    return out
+
+
+def _ordered_keys(keys):
+    # Kunci unik dalam urutan kemunculan pertama (sama seperti urutan dict)
+    uniq, first = np.unique(keys, return_index=True)
+    return uniq[np.argsort(first, kind='stable')]
+
+
+# Jumlah sisi per potongan di aggregate_match_table (genap: dua sisi satu match
+# selalu di potongan yang sama)
+AGGREGATE_CHUNK = 1 << 16
+COUNT_ARRAYS = ('pick_win', 'pick_lose', 'banned', 'pair_win', 'pair_lose', 'versus_win', 'versus_lose')
+
+
+def _aggregate_rows(win, picks, bans, name_rank, n_heroes):
+    n_cells = n_heroes * n_heroes
+    n_sides, width = picks.shape
+
+    # hero_stats
+    pick_valid = picks >= 0
+    win_rows = np.broadcast_to(win[:, None], picks.shape)
+    pick_win = np.bincount(picks[pick_valid & win_rows], minlength=n_heroes)
+    pick_lose = np.bincount(picks[pick_valid & ~win_rows], minlength=n_heroes)
+    banned = np.bincount(bans[bans >= 0], minlength=n_heroes)
+
+    # pair_wins: kombinasi pick yang diurutkan berdasarkan nama hero
+    by_name = np.where(pick_valid, name_rank[np.maximum(picks, 0)], n_heroes)
+    by_name = np.take_along_axis(picks, np.argsort(by_name, axis=1, kind='stable'), axis=1)
+    i, j = np.triu_indices(width, 1)
+    a = by_name[:, i].ravel()
+    b = by_name[:, j].ravel()
+    pair_win_flag = np.repeat(win, len(i))
+    valid = (a >= 0) & (b >= 0)
+    a, b, pair_win_flag = a[valid], b[valid], pair_win_flag[valid]
+    keys = a.astype(np.int64) * n_heroes + b
+    upper_win = np.bincount(keys[pair_win_flag], minlength=n_cells).reshape(n_heroes, n_heroes)
+    upper_lose = np.bincount(keys[~pair_win_flag], minlength=n_cells).reshape(n_heroes, n_heroes)
+    pair_win = upper_win + upper_win.T - np.diag(np.diag(upper_win))
+    pair_lose = upper_lose + upper_lose.T - np.diag(np.diag(upper_lose))
+
+    # versus: setiap pick sisi A melawan setiap pick sisi B, dua arah per match
+    side_a = np.arange(n_sides)
+    side_b = side_a ^ 1
+    h1 = np.repeat(picks[side_a], width, axis=1).ravel()
+    h2 = np.tile(picks[side_b], (1, width)).ravel()
+    versus_win_flag = np.repeat(win[side_a], width * width)
+    valid = (h1 >= 0) & (h2 >= 0)
+    h1, h2, versus_win_flag = h1[valid], h2[valid], versus_win_flag[valid]
+    versus_keys = h1.astype(np.int64) * n_heroes + h2
+    versus_win = np.bincount(versus_keys[versus_win_flag], minlength=n_cells).reshape(n_heroes, n_heroes)
+    versus_lose = np.bincount(versus_keys[~versus_win_flag], minlength=n_cells).reshape(n_heroes, n_heroes)
+
+    return {
+        'pick_win': pick_win,
+        'pick_lose': pick_lose,
+        'banned': banned,
+        'pair_win': pair_win,
+        'pair_lose': pair_lose,
+        'versus_win': versus_win,
+        'versus_lose': versus_lose,
+        'pair_order': keys,
+        'versus_order': versus_keys,
+    }
+
+
+@stage('aggregate_match_table')
+def aggregate_match_table(table):
+    # Tabel match diagregasi per AGGREGATE_CHUNK sisi, supaya array sementara
+    # (pasangan dan versus per sisi) tidak tumbuh dengan jumlah match
+    n_heroes = len(table['heroes'])
+    n_cells = n_heroes * n_heroes
+    name_rank = np.empty(n_heroes, dtype=np.int64)
+    name_rank[np.argsort(np.array(table['heroes'], dtype=object), kind='stable')] = np.arange(n_heroes)
+
+    result = {name: np.zeros(n_heroes if name in ('pick_win', 'pick_lose', 'banned') else (n_heroes, n_heroes),
+                             dtype=np.int64) for name in COUNT_ARRAYS}
+    orders = {'pair_order': [], 'versus_order': []}
+    seen = {name: np.zeros(n_cells, dtype=bool) for name in orders}
+    for start in range(0, len(table['side_win']), AGGREGATE_CHUNK):
+        rows = slice(start, start + AGGREGATE_CHUNK)
+        part = _aggregate_rows(table['side_win'][rows].astype(bool), table['side_picks'][rows],
+                               table['side_bans'][rows], name_rank, n_heroes)
+        for name in COUNT_ARRAYS:
+            result[name] += part[name]
+        # Urutan kemunculan pertama: kunci yang belum pernah muncul di potongan sebelumnya
+        for name in orders:
+            keys = _ordered_keys(part[name])
+            keys = keys[~seen[name][keys]]
+            seen[name][keys] = True
+            orders[name].append(keys)
+    for name, parts in orders.items():
+        result[name] = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+    return result
+
+
+def process_csv_matrix(filename):
+    matches = read_match_data(filename, ban_phase=True)
+    stats = build_match_table(matches)
+    stats.update(aggregate_match_table(stats))
+    stats['matches'] = matches
+    return stats
+
+
+def process_csv_matrix_streaming(filename):
+    # Seperti process_csv_matrix tanpa daftar `matches`: tabel match dibangun
+    # langsung dari draft_graph.iter_csv_matches (baris tiap match harus berurutan)
+    from draft_graph import iter_csv_matches
+    stats = build_match_table(iter_csv_matches(filename, ban_phase=True))
+    stats.update(aggregate_match_table(stats))
+    return stats
+
+
+@stage('matrix_to_dicts')
+def matrix_to_dicts(stats):
+    # Konversi ke bentuk dict yang sama dengan process_csv_with_matches
+    heroes = stats['heroes']
+    n_heroes = len(heroes)
+    hero_stats = defaultdict(lambda: {'pick_win': 0, 'pick_lose': 0, 'banned': 0})
+    pair_wins = defaultdict(lambda: {'win': 0, 'lose': 0, 'freq': 0})
+    versus = defaultdict(lambda: {'win': 0, 'lose': 0})
+
+    pick_win = stats['pick_win'].tolist()
+    pick_lose = stats['pick_lose'].tolist()
+    banned = stats['banned'].tolist()
+    for h, hero in enumerate(heroes):
+        hero_stats[hero] = {'pick_win': pick_win[h], 'pick_lose': pick_lose[h], 'banned': banned[h]}
+
+    order = np.asarray(stats['pair_order'], dtype=np.int64)
+    a, b = order // n_heroes, order % n_heroes
+    wins = stats['pair_win'][a, b].tolist()
+    loses = stats['pair_lose'][a, b].tolist()
+    for h1, h2, win, lose in zip(a.tolist(), b.tolist(), wins, loses):
+        pair_wins[(heroes[h1], heroes[h2])] = {'win': win, 'lose': lose, 'freq': win + lose}
+
+    order = np.asarray(stats['versus_order'], dtype=np.int64)
+    a, b = order // n_heroes, order % n_heroes
+    wins = stats['versus_win'][a, b].tolist()
+    loses = stats['versus_lose'][a, b].tolist()
+    for h1, h2, win, lose in zip(a.tolist(), b.tolist(), wins, loses):
+        versus[(heroes[h1], heroes[h2])] = {'win': win, 'lose': lose}
+
+    return hero_stats, pair_wins, versus
+
+
+@stage('table_to_matches')
+def table_to_matches(stats):
+    heroes = stats['heroes']
+    teams = stats['teams']
+    side_team = stats['side_team'].tolist()
+    side_win = stats['side_win'].tolist()
+    side_picks = stats['side_picks'].tolist()
+    side_bans = stats['side_bans'].tolist()
+    side_ban_phase = stats['side_ban_phase'].tolist()
+    matches = []
+    for r in range(0, len(side_team), 2):
+        match = {'teams': {}}
+        for side in (r, r + 1):
+            match['teams'][teams[side_team[side]]] = {
+                'pick': [heroes[h] for h in side_picks[side] if h >= 0],
+                'ban': [heroes[h] for h in side_bans[side] if h >= 0],
+                'ban_phase': [p for h, p in zip(side_bans[side], side_ban_phase[side]) if h >= 0],
+                'is_winner': side_win[side],
+            }
+        matches.append(match)
+    return matches
+
+
+def compute_team_weights(stats):
+    # Tabel bobot hero per tim (sama dengan hero_team_weights di build_sinergi_tim_graph)
+    n_heroes = len(stats['heroes'])
+    weights = np.zeros((len(stats['teams']), n_heroes), dtype=np.float64)
+    picks = np.sort(stats['side_picks'], axis=1)
+    bans = np.sort(stats['side_bans'], axis=1)[np.arange(len(picks)) ^ 1]
+    # Hero yang sama hanya dihitung sekali per match (set)
+    picks = np.where(np.diff(picks, axis=1, prepend=-2) == 0, -1, picks)
+    bans = np.where(np.diff(bans, axis=1, prepend=-2) == 0, -1, bans)
+
+    pick_bonus = np.where(stats['side_win'] != 0, 0.3, 0.2)
+    heroes = np.concatenate([picks, bans], axis=1)
+    bonus = np.concatenate([
+        np.broadcast_to(pick_bonus[:, None], picks.shape),
+        np.full(bans.shape, 0.5),
+    ], axis=1)
+    team = np.broadcast_to(stats['side_team'][:, None], heroes.shape)
+    valid = heroes >= 0
+    np.add.at(weights, (team[valid], heroes[valid]), bonus[valid])
+    return weights
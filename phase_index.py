@@ -0,0 +1,164 @@
+import argparse
+import numpy as np
+from draft_sequence import add_state_arguments, match_actions, state_from_args
+from main import DEFAULT_CSV, load_model
+from matrix_stats import BAN_PHASES
+from profiling import stage
+
+# Statistik draft per fase, dibangun dari tabel match di model['stats'].
+# Fase setiap ban diambil dari side_ban_phase (kolom 'lane' CSV: 'first' = 3
+# ban pertama, 'second' = 2 ban berikutnya); jika tidak tercatat, dari urutan
+# ban. Fase pick diambil dari DRAFT_ORDER: 3 pick pertama tiap tim di fase
+# pertama, 2 sisanya di fase kedua.
+#
+# Semua tabel berupa array numpy dengan id hero dari model['stats']['hero_index']
+# (dense seperti matriks di matrix_stats, dengan sumbu pertama = fase):
+#   freq[a, p, h]            hero h di-pick (a=0) / di-ban (a=1) pada fase p
+#   team_freq[a, p, t, h]    sama, per tim
+#   pick_after_pick[p, x, h] tim pick h di fase p saat x sudah di-pick tim itu
+#   ban_after_ban[p, x, h]   tim ban h di fase p setelah lawan mem-ban x
+#   ban_after_pick[p, x, h]  tim ban h di fase p setelah lawan mem-pick x
+
+PHASES = BAN_PHASES
+ACTIONS = ('pick', 'ban')
+PICKS_PER_FIRST_PHASE = 3
+BANS_PER_FIRST_PHASE = 3
+
+
+def table_matches(stats):
+    # Match dari tabel match dengan id tim/hero (bukan nama) dan fase tiap ban
+    side_team = stats['side_team'].tolist()
+    side_picks = stats['side_picks'].tolist()
+    side_bans = stats['side_bans'].tolist()
+    side_ban_phase = stats['side_ban_phase'].tolist()
+    for r in range(0, len(side_team), 2):
+        teams = {}
+        for side in (r, r + 1):
+            bans = [(h, p) for h, p in zip(side_bans[side], side_ban_phase[side]) if h >= 0]
+            teams[side_team[side]] = {
+                'pick': [h for h in side_picks[side] if h >= 0],
+                'ban': [h for h, _ in bans],
+                'ban_phase': [p for _, p in bans],
+            }
+        yield {'teams': teams}
+
+
+def action_phases(match):
+    # (team, action, hero, fase) sesuai urutan draft
+    seen = {(team, action): 0 for team in match['teams'] for action in ACTIONS}
+    for team, action, hero in match_actions(match):
+        n = seen[(team, action)]
+        seen[(team, action)] += 1
+        if action == 'ban':
+            recorded = match['teams'][team]['ban_phase']
+            phase = recorded[n] if n < len(recorded) and recorded[n] >= 0 else int(n >= BANS_PER_FIRST_PHASE)
+        else:
+            phase = int(n >= PICKS_PER_FIRST_PHASE)
+        yield team, action, hero, phase
+
+
+@stage('build_phase_index')
+def build_phase_index(stats):
+    events = []
+    conditional = {'pick_after_pick': [], 'ban_after_ban': [], 'ban_after_pick': []}
+    for match in table_matches(stats):
+        done = {team: {'pick': [], 'ban': []} for team in match['teams']}
+        for team, action, h, phase in action_phases(match):
+            enemy = next(t for t in done if t != team)
+            events.append((ACTIONS.index(action), phase, team, h))
+            if action == 'pick':
+                conditional['pick_after_pick'].extend((phase, x, h) for x in done[team]['pick'])
+            else:
+                conditional['ban_after_ban'].extend((phase, x, h) for x in done[enemy]['ban'])
+                conditional['ban_after_pick'].extend((phase, x, h) for x in done[enemy]['pick'])
+            done[team][action].append(h)
+
+    n_heroes, n_teams = len(stats['heroes']), len(stats['teams'])
+    events = np.array(events, dtype=np.int64).reshape(-1, 4)
+    team_freq = np.zeros((len(ACTIONS), len(PHASES), n_teams, n_heroes), dtype=np.int64)
+    np.add.at(team_freq, tuple(events.T), 1)
+    index = {
+        'heroes': stats['heroes'],
+        'hero_index': stats['hero_index'],
+        'teams': stats['teams'],
+        'team_index': stats['team_index'],
+        'freq': team_freq.sum(axis=2),
+        'team_freq': team_freq,
+    }
+    for name, rows in conditional.items():
+        table = np.zeros((len(PHASES), n_heroes, n_heroes), dtype=np.int64)
+        np.add.at(table, tuple(np.array(rows, dtype=np.int64).reshape(-1, 3).T), 1)
+        index[name] = table
+    return index
+
+
+def load_phase_index(sources=DEFAULT_CSV, model=None):
+    model = model if model is not None else load_model(sources)
+    return build_phase_index(model['stats'])
+
+
+def state_phase(state):
+    # Fase dari jumlah aksi tim sendiri, tanpa perlu cocok persis dengan DRAFT_ORDER
+    if state['action'] == 'pick':
+        return int(len(state['our_picks']) >= PICKS_PER_FIRST_PHASE)
+    return int(len(state['our_bans']) >= BANS_PER_FIRST_PHASE)
+
+
+def _rate(table, given):
+    # Peluang tiap hero di baris-baris `given`, dinormalisasi jumlah kejadian
+    rows = table[given].sum(axis=0) if given else np.zeros(table.shape[-1], dtype=np.int64)
+    total = rows.sum()
+    return rows / total if total else rows.astype(np.float64)
+
+
+def phase_lookup(index, state, phase=None):
+    # Frekuensi tim pada fase sekarang dan frekuensi kondisional terhadap draft saat ini
+    phase = state_phase(state) if phase is None else phase
+    hero_index = index['hero_index']
+    ids = lambda heroes: [hero_index[h] for h in heroes if h in hero_index]
+    a = ACTIONS.index(state['action'])
+
+    t = index['team_index'].get(state['team'])
+    counts = index['team_freq'][a, phase, t] if t is not None else index['freq'][a, phase]
+    frequency = counts / counts.sum() if counts.sum() else counts.astype(np.float64)
+
+    if state['action'] == 'pick':
+        conditional = _rate(index['pick_after_pick'][phase], ids(state['our_picks']))
+    else:
+        conditional = (_rate(index['ban_after_ban'][phase], ids(state['enemy_bans']))
+                       + _rate(index['ban_after_pick'][phase], ids(state['enemy_picks']))) / 2
+
+    taken = ids(state['our_picks'] + state['our_bans'] + state['enemy_picks'] + state['enemy_bans'])
+    frequency, conditional = frequency.copy(), conditional.copy()
+    frequency[taken] = conditional[taken] = 0.0
+    return {'phase': PHASES[phase], 'frequency': frequency, 'conditional': conditional}
+
+
+def top_heroes(index, values, top_n=5):
+    order = np.argsort(-values, kind='stable')[:top_n]
+    return [(index['heroes'][h], values[h].item()) for h in order.tolist() if values[h] > 0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Statistik pick/ban per fase draft')
+    add_state_arguments(parser)
+    parser.add_argument('-k', '--top', type=int, default=5)
+    parser.add_argument('--csv', action='append', help='file CSV atau folder (boleh diulang)')
+    args = parser.parse_args(argv)
+
+    state = state_from_args(args)
+    index = load_phase_index(args.csv or DEFAULT_CSV)
+    lookup = phase_lookup(index, state)
+
+    print(f"\n{args.action.upper()} phase: {lookup['phase']}")
+    print(f"Most frequent for {state['team']} in this phase:")
+    for hero, p in top_heroes(index, lookup['frequency'], args.top):
+        print(f"{hero} : {p * 100:.1f}%")
+    given = 'our picks' if args.action == 'pick' else 'enemy picks/bans'
+    print(f"Most frequent given {given}:")
+    for hero, p in top_heroes(index, lookup['conditional'], args.top):
+        print(f"{hero} : {p * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import atexit
+import functools
+import os
+import threading
+import time
+
+# Instrumentasi per tahap pipeline (parse CSV, build graf, scoring, filter lane).
+#
+# Aktif lewat environment variable sebelum program dijalankan:
+#   DRAFT_PROFILE=json      catat waktu, jumlah panggilan dan alokasi per tahap
+#   DRAFT_PROFILE=cprofile  sama, ditambah file .prof (pstats) per query
+#   DRAFT_PROFILE_DIR=...   folder output (default: profiles)
+# Jika tidak aktif, @stage dan @query mengembalikan fungsi aslinya sehingga
+# tidak ada overhead sama sekali.
+
+MODE = os.environ.get('DRAFT_PROFILE', '').strip().lower()
+if MODE in ('1', 'true', 'yes', 'on'):
+    MODE = 'json'
+ENABLED = MODE in ('json', 'cprofile')
+if ENABLED:
+    # Hanya dimuat jika profiling aktif (import program tetap ringan)
+    import cProfile
+    import json
+    import tracemalloc
+OUTPUT_DIR = os.environ.get('DRAFT_PROFILE_DIR', 'profiles')
+
+_totals = {}
+_lock = threading.Lock()
+_local = threading.local()
+_query_count = 0
+
+
+def _add(records, name, seconds, alloc_bytes, peak_bytes):
+    entry = records.setdefault(name, {'calls': 0, 'seconds': 0.0, 'alloc_bytes': 0})
+    entry['calls'] += 1
+    entry['seconds'] += seconds
+    entry['alloc_bytes'] += alloc_bytes
+    if peak_bytes is not None:
+        entry['peak_bytes'] = max(entry.get('peak_bytes', 0), peak_bytes)
+
+
+def _run_stage(name, func, args, kwargs):
+    depth = getattr(_local, 'depth', 0)
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    if depth == 0:
+        tracemalloc.reset_peak()
+    _local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        seconds = time.perf_counter() - start
+        _local.depth = depth
+        current, peak = tracemalloc.get_traced_memory()
+        # Puncak alokasi hanya akurat untuk tahap terluar (reset_peak bersifat global)
+        peak_bytes = peak - start_bytes if depth == 0 else None
+        with _lock:
+            _add(_totals, name, seconds, current - start_bytes, peak_bytes)
+        records = getattr(_local, 'records', None)
+        if records is not None:
+            _add(records, name, seconds, current - start_bytes, peak_bytes)
+
+
+def stage(name):
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return _run_stage(name, func, args, kwargs)
+        return wrapper
+    return decorate
+
+
+def _write_json(path, payload):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+
+
+def query(name):
+    # Satu query rekomendasi/visualisasi: tahap-tahap di dalamnya diekspor
+    # ke <OUTPUT_DIR>/<name>-<pid>-<n>.json (dan .prof untuk mode cprofile)
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            global _query_count
+            with _lock:
+                _query_count += 1
+                number = _query_count
+            _local.records = {}
+            profiler = cProfile.Profile() if MODE == 'cprofile' else None
+            start = time.perf_counter()
+            try:
+                if profiler is not None:
+                    return profiler.runcall(_run_stage, name, func, args, kwargs)
+                return _run_stage(name, func, args, kwargs)
+            finally:
+                wall = time.perf_counter() - start
+                records, _local.records = _local.records, None
+                base = os.path.join(OUTPUT_DIR, f'{name}-{os.getpid()}-{number:04d}')
+                _write_json(base + '.json', {'query': name, 'number': number,
+                                             'wall_seconds': wall, 'stages': records})
+                if profiler is not None:
+                    profiler.dump_stats(base + '.prof')
+        return wrapper
+    return decorate
+
+
+def totals():
+    with _lock:
+        return {name: dict(entry) for name, entry in _totals.items()}
+
+
+def _write_session():
+    if _totals:
+        _write_json(os.path.join(OUTPUT_DIR, f'session-{os.getpid()}.json'), {'stages': totals()})
+
+
+if ENABLED:
+    tracemalloc.start()
+    atexit.register(_write_session)
@@ -0,0 +1,49 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Cache hasil rekomendasi per draft state (LRU + TTL opsional).
+# Urutan hero di daftar pick/ban tidak mempengaruhi hasil rank_heroes, jadi
+# state dikanonikkan dengan mengurutkan tiap daftar.
+
+
+def state_key(action_type, team_name, enemy_team, our_picks, our_bans, enemy_picks, enemy_bans, top_n=5):
+    return (action_type, team_name, enemy_team, tuple(sorted(our_picks)), tuple(sorted(our_bans)),
+            tuple(sorted(enemy_picks)), tuple(sorted(enemy_bans)), top_n)
+
+
+class RecommendationCache:
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def info(self):
+        return {'size': len(self.entries), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,208 @@
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from draft_sequence import LIST_FIELDS, empty_state, state_args
+from incremental import add_matches, validate_match
+from main import DEFAULT_CSV, cached_rank_heroes, load_model
+from profiling import query
+from recommend_cache import RecommendationCache
+from windowed import RollingWindow, window_bounds
+
+# Server rekomendasi lokal: G_dasar, G_counter dan tabel bobot tim tetap di
+# memori, rank_heroes dipanggil lewat JSON API.
+#
+#   POST /recommend  {"action": "pick", "team": "onic", "enemy": "rrq",
+#                     "our_picks": [...], "our_bans": [...],
+#                     "enemy_picks": [...], "enemy_bans": [...], "top_n": 5,
+#                     "window": {"last": 100, "half_life": 30}}   (opsional, lihat windowed.py)
+#   POST /matches    [{"teams": {"onic": {"pick": [...], "ban": [...], "is_winner": 1}, ...}}, ...]
+#   GET  /health
+
+
+def parse_state(body):
+    if not isinstance(body, dict):
+        raise ValueError("Body harus berupa objek JSON.")
+    for field in ('action', 'team', 'enemy'):
+        if not isinstance(body.get(field), str):
+            raise ValueError(f"Field '{field}' wajib diisi.")
+    state = empty_state(body['action'].strip().lower(), body['team'].strip().lower(),
+                        body['enemy'].strip().lower())
+    if state['action'] not in ('pick', 'ban'):
+        raise ValueError("Field 'action' harus 'pick' atau 'ban'.")
+    for field in LIST_FIELDS:
+        heroes = body.get(field, [])
+        if not isinstance(heroes, list):
+            raise ValueError(f"Field '{field}' harus berupa list.")
+        state[field] = [str(h).strip().lower() for h in heroes if str(h).strip()]
+    return state
+
+
+def parse_top_n(body):
+    top_n = body.get('top_n', 5)
+    if isinstance(top_n, bool) or not isinstance(top_n, int) or top_n <= 0:
+        raise ValueError("Field 'top_n' harus bilangan bulat positif.")
+    return top_n
+
+
+def parse_window(body):
+    window = body.get('window')
+    if window is None:
+        return None
+    if not isinstance(window, dict) or not set(window) <= {'start', 'end', 'last', 'half_life'}:
+        raise ValueError("Field 'window' harus objek dengan start/end/last/half_life.")
+    spec = {key: window.get(key) for key in ('start', 'end', 'last', 'half_life')}
+    for key in ('start', 'end', 'last'):
+        value = spec[key]
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+            raise ValueError(f"window.{key} harus bilangan bulat tidak negatif.")
+    half_life = spec['half_life']
+    if half_life is not None and (isinstance(half_life, bool) or not isinstance(half_life, (int, float))
+                                  or not half_life > 0):
+        raise ValueError("window.half_life harus angka lebih dari 0.")
+    return tuple(spec.items())
+
+
+def n_matches(model):
+    # Dari tabel match, tanpa membangun daftar `matches` (lihat snapshot.DraftModel)
+    return len(model['stats']['side_team']) // 2
+
+
+class RecommendationService:
+    max_windows = 16
+
+    def __init__(self, model, cache_size=4096, cache_ttl=None):
+        self.model = model
+        # add_matches mengubah model di tempat; query menunggu update selesai
+        self.lock = threading.Lock()
+        # Hasil per draft state, satu cache per jendela (None = seluruh data);
+        # dikosongkan setiap ada match baru
+        self.cache_size, self.cache_ttl = cache_size, cache_ttl
+        self.caches = {None: RecommendationCache(cache_size, cache_ttl)}
+        # Jendela yang pernah diminta tetap disimpan dan hanya digeser saat ada match baru
+        self.windows = {}
+
+    def _window_model(self, spec):
+        window = self.windows.pop(spec, None)
+        if window is None:
+            if len(self.windows) >= self.max_windows:
+                oldest = next(iter(self.windows))
+                del self.windows[oldest], self.caches[oldest]
+            window = RollingWindow(self.model, half_life=dict(spec)['half_life'])
+            self.caches[spec] = RecommendationCache(self.cache_size, self.cache_ttl)
+        self.windows[spec] = window
+        params = dict(spec)
+        bounds = window_bounds(window.n_matches(), *(params[key] for key in ('start', 'end', 'last')))
+        window.seek(*bounds)
+        return window.window_model()
+
+    @query('recommend')
+    def recommend(self, body):
+        state = parse_state(body)
+        top_n = parse_top_n(body)
+        spec = parse_window(body)
+        with self.lock:
+            model = self.model if spec is None else self._window_model(spec)
+            ranked = cached_rank_heroes(model, *state_args(state), top_n=top_n, cache=self.caches[spec])
+        return {
+            'action': state['action'],
+            'team': state['team'],
+            'enemy': state['enemy'],
+            'recommendations': [{'hero': hero, 'score': score} for hero, score in ranked],
+        }
+
+    def ingest(self, body):
+        if not isinstance(body, list):
+            raise ValueError("Body harus berupa list match.")
+        # Payload dicek sebelum lock; match yang tidak valid tidak mengubah model
+        for match in body:
+            validate_match(match)
+        with self.lock:
+            before = n_matches(self.model)
+            try:
+                added = add_matches(self.model, body)
+            finally:
+                # Hasil cache tidak berlaku lagi begitu model berubah, walaupun ada error
+                if n_matches(self.model) != before:
+                    for cache in self.caches.values():
+                        cache.clear()
+            total = n_matches(self.model)
+        return {'added': added, 'matches': total}
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'heroes': len(self.model['stats']['heroes']),
+            'matches': n_matches(self.model),
+            'cache': self.caches[None].info(),
+        }
+
+
+class RecommendationHandler(BaseHTTPRequestHandler):
+    service = None
+    protocol_version = 'HTTP/1.1'
+    # Header dan body dikirim terpisah; tanpa ini keep-alive kena delay Nagle/delayed ACK
+    disable_nagle_algorithm = True
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'null')
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, self.service.health())
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        routes = {'/recommend': self.service.recommend, '/matches': self.service.ingest}
+        handler = routes.get(self.path)
+        if handler is None:
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            self._send(200, handler(self._read_json()))
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {'error': str(e)})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(model, host='127.0.0.1', port=8000, cache_size=4096, cache_ttl=None):
+    handler = type('Handler', (RecommendationHandler,), {'service': RecommendationService(model, cache_size, cache_ttl)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Draft pick recommendation server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--csv', action='append', help='file CSV atau folder (boleh diulang)')
+    parser.add_argument('--cache-size', type=int, default=4096, help='jumlah draft state yang di-cache')
+    parser.add_argument('--cache-ttl', type=float, help='umur maksimum hasil cache (detik)')
+    args = parser.parse_args(argv)
+
+    server = make_server(load_model(args.csv or DEFAULT_CSV), args.host, args.port,
+                         args.cache_size, args.cache_ttl)
+    print(f"Server berjalan di http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
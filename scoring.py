@@ -0,0 +1,203 @@
+import heapq
+import numpy as np
+from profiling import stage
+
+# Kernel penilaian hero berbasis matriks adjacency.
+# Nilai hero_value untuk semua kandidat dihitung sekaligus:
+#   sinergi(h) = sum_nb (w_dasar(h, nb) + bonus[h] + bonus[nb])
+#              = strength[h] + degree[h] * bonus[h] + (A @ bonus)[h]
+#   counter(h) = sum_e C[h, e] - C[e, h] = ((C - C.T) @ enemy_count)[h]
+#
+# Hasil antara disimpan di dalam matriks skor (ikut terhapus saat data berubah):
+# vektor sinergi per tim, dan vektor counter per urutan pick lawan. Vektor
+# counter untuk [a, b, c] dibangun dari vektor [a, b] ditambah kolom c, sehingga
+# state draft yang berurutan memakai ulang hasil langkah sebelumnya.
+#
+# top_candidates tidak menilai semua hero. Batas atas skor per hero:
+#   sinergi(h) + jumlah k nilai terbesar di baris counter_delta[h]   (k = jumlah lawan)
+# dipakai untuk mengurutkan kandidat (sekali per tim dan k). Kandidat dinilai
+# per blok sesuai urutan itu, dan berhenti begitu batas atas blok berikutnya
+# di bawah skor kandidat ke-top_n yang lolos filter.
+
+PARTIAL_CACHE_SIZE = 4096
+PRUNE_BLOCK = 16
+# Di bawah jumlah hero ini menilai semua hero sekaligus lebih cepat
+PRUNE_MIN_HEROES = 256
+# Selisih pembulatan antara batas atas dan skor sebenarnya
+BOUND_MARGIN = 1e-6
+
+
+@stage('build_score_matrices')
+def build_score_matrices(model):
+    stats = model['stats']
+    n_heroes = len(stats['heroes'])
+    heroes = stats['heroes']
+    synergy, present = model['G_dasar'].dense(heroes)
+    adjacency = present.astype(np.float64)
+    counter, _ = model['G_counter'].dense(heroes)
+
+    # Urutan node G_dasar dipakai untuk memecah skor yang sama (seperti sorted())
+    order = model['G_dasar'].node_positions(heroes)
+
+    return {
+        'n_heroes': n_heroes,
+        'adjacency': adjacency,
+        'strength': synergy.sum(axis=1),
+        'degree': adjacency.sum(axis=1),
+        'self_loop': np.diag(adjacency).copy(),
+        'counter_delta': counter - counter.T,
+        'candidates': order < n_heroes,
+        'order': order,
+    }
+
+
+def get_score_matrices(model):
+    # Disimpan di model; incremental.add_matches menghapusnya saat graf berubah
+    matrices = model.get('score_matrices')
+    if matrices is None or matrices['n_heroes'] != len(model['stats']['heroes']):
+        matrices = build_score_matrices(model)
+        model['score_matrices'] = matrices
+    return matrices
+
+
+def team_bonus_vector(model, team_name):
+    stats = model['stats']
+    row = stats['team_index'].get(team_name)
+    if row is None:
+        return np.zeros(len(stats['heroes']), dtype=np.float64)
+    return np.asarray(stats['team_weights'][row], dtype=np.float64)
+
+
+def hero_count_vector(model, heroes):
+    hero_index = model['stats']['hero_index']
+    counts = np.zeros(len(model['stats']['heroes']), dtype=np.float64)
+    for hero in heroes:
+        if hero in hero_index:
+            counts[hero_index[hero]] += 1
+    return counts
+
+
+def _remember(cache, key, value):
+    value.flags.writeable = False
+    cache[key] = value
+    if len(cache) > PARTIAL_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    return value
+
+
+def synergy_all(model, team_name):
+    # Bagian sinergi dari hero_value untuk semua hero (read-only, di-cache per tim)
+    m = get_score_matrices(model)
+    cache = m.setdefault('synergy_cache', {})
+    synergy = cache.get(team_name)
+    if synergy is None:
+        bonus = team_bonus_vector(model, team_name)
+        synergy = _remember(cache, team_name,
+                            m['strength'] + (m['degree'] - m['self_loop']) * bonus + m['adjacency'] @ bonus)
+    return synergy
+
+
+def counter_all(model, enemy_heroes):
+    # Bagian counter dari hero_value untuk semua hero melawan enemy_heroes
+    m = get_score_matrices(model)
+    hero_index = model['stats']['hero_index']
+    ids = tuple(hero_index[h] for h in enemy_heroes if h in hero_index)
+    cache = m.setdefault('counter_cache', {})
+    counter = cache.get(ids)
+    if counter is not None:
+        return counter
+    # Mulai dari prefix terpanjang yang sudah pernah dihitung
+    known = len(ids)
+    while known and ids[:known] not in cache:
+        known -= 1
+    counter = cache[ids[:known]] if known else np.zeros(m['n_heroes'], dtype=np.float64)
+    for end in range(known + 1, len(ids) + 1):
+        counter = _remember(cache, ids[:end], counter + m['counter_delta'][:, ids[end - 1]])
+    return counter
+
+
+@stage('score_all')
+def score_all(model, team_name, enemy_heroes):
+    # Sama dengan hero_value(h, G_dasar, G_counter, _, enemy_heroes, bonus tim) untuk semua h
+    return synergy_all(model, team_name) + counter_all(model, enemy_heroes)
+
+
+@stage('rank_candidates')
+def rank_candidates(model, scores, excluded):
+    # Id hero kandidat, skor menurun; hero di excluded (pick/ban) di-mask
+    m = get_score_matrices(model)
+    mask = m['candidates'] & (hero_count_vector(model, excluded) == 0)
+    ids = np.flatnonzero(mask)
+    # Dibulatkan agar skor yang sama tidak terpisah oleh selisih pembulatan float
+    return ids[np.lexsort((m['order'][ids], -np.round(scores[ids], 9)))]
+
+
+def counter_bounds(m):
+    # counter_bound[h, k] = jumlah k nilai terbesar di baris counter_delta[h]
+    bounds = m.get('counter_bound')
+    if bounds is None:
+        delta = m['counter_delta']
+        bounds = np.zeros((len(delta), len(delta) + 1), dtype=np.float64)
+        np.cumsum(-np.sort(-delta, axis=1), axis=1, out=bounds[:, 1:])
+        bounds.flags.writeable = False
+        m['counter_bound'] = bounds
+    return bounds
+
+
+def bound_order(model, team_name, k):
+    # Kandidat terurut menurun berdasarkan batas atas skor (di-cache per tim dan k)
+    m = get_score_matrices(model)
+    orders = m.setdefault('bound_order_cache', {})
+    bounds = m.setdefault('bound_cache', {})
+    key = (team_name, k)
+    if key not in orders:
+        upper = synergy_all(model, team_name) + counter_bounds(m)[:, min(k, m['n_heroes'])]
+        ids = np.flatnonzero(m['candidates'])
+        ids = ids[np.argsort(-upper[ids], kind='stable')]
+        _remember(bounds, key, upper[ids])
+        _remember(orders, key, ids)
+    return orders[key], bounds[key]
+
+
+@stage('top_candidates')
+def top_candidates(model, team_name, enemy_heroes, excluded, accept, top_n=5):
+    # Seperti rank_candidates(score_all(...)), tetapi hanya hero yang mungkin masuk
+    # top_n (di antara yang lolos accept(id)) yang dinilai. Mengembalikan id
+    # terurut dan skornya.
+    m = get_score_matrices(model)
+    hero_index = model['stats']['hero_index']
+    enemy_ids = [hero_index[h] for h in enemy_heroes if h in hero_index]
+    if m['n_heroes'] < PRUNE_MIN_HEROES or len(set(enemy_ids)) != len(enemy_ids):
+        # Batas atas hanya berlaku untuk lawan yang berbeda-beda
+        scores = score_all(model, team_name, enemy_heroes)
+        ranked = rank_candidates(model, scores, excluded)
+        return ranked, scores[ranked]
+
+    excluded_ids = {hero_index[h] for h in excluded if h in hero_index}
+    order, upper = bound_order(model, team_name, len(enemy_ids))
+    synergy = synergy_all(model, team_name)
+    delta = m['counter_delta']
+    seen, seen_scores, accepted = [], [], []
+    threshold = -np.inf
+    for start in range(0, len(order), PRUNE_BLOCK):
+        if upper[start] < threshold - BOUND_MARGIN:
+            break
+        block = order[start:start + PRUNE_BLOCK]
+        # Urutan penjumlahan sama dengan counter_all, jadi skornya identik
+        counter = np.zeros(len(block), dtype=np.float64)
+        for e in enemy_ids:
+            counter = counter + delta[block, e]
+        for h, score in zip(block.tolist(), (synergy[block] + counter).tolist()):
+            if h in excluded_ids:
+                continue
+            seen.append(h)
+            seen_scores.append(score)
+            if accept(h):
+                accepted.append(score)
+        if top_n > 0 and len(accepted) >= top_n:
+            threshold = heapq.nlargest(top_n, accepted)[-1]
+
+    ids = np.array(seen, dtype=np.int64)
+    scores = np.array(seen_scores, dtype=np.float64)
+    ranking = np.lexsort((m['order'][ids], -np.round(scores, 9)))
+    return ids[ranking], scores[ranking]
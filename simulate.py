@@ -0,0 +1,193 @@
+import argparse
+import time
+from multiprocessing import Pool
+import numpy as np
+from draft_sequence import DRAFT_ORDER, add_state_arguments, check_turn, hero_list, locate_step, state_args, state_from_args
+from main import DEFAULT_CSV, load_model, rank_heroes
+from profiling import query, stage
+
+# Simulasi Monte Carlo: dari state draft sekarang, setiap kandidat dicoba lalu
+# sisa DRAFT_ORDER diisi secara acak ribuan kali. Pick/ban kedua tim diambil
+# dari kecenderungan tim di data historis (frekuensi pick/ban tim, dihaluskan
+# dengan frekuensi global). Line-up akhir dinilai dengan log-odds:
+#   skor = rata2 hero_lo(A) - rata2 hero_lo(B)
+#        + rata2 pair_lo(pasangan A) - rata2 pair_lo(pasangan B)
+#        + rata2 versus_lo(a, b)
+#   hero_lo = log((menang + 1) / (kalah + 1)), begitu juga pair_lo dari pair_wins
+#   dan versus_lo dari versus; P(menang) = sigmoid(skor).
+# Semua rollout berjalan bersamaan sebagai array (satu baris per rollout), dan
+# bisa dibagi ke beberapa proses. Batasan lane tidak dipakai saat sampling.
+
+# Bobot frekuensi global dalam satuan "jumlah aksi" tim
+PRIOR_WEIGHT = 10.0
+
+
+def log_odds(win, lose):
+    return np.log((win + 1.0) / (lose + 1.0))
+
+
+def team_tendencies(stats, action):
+    # Frekuensi pick/ban per tim (T, H) dan global (H,) dari tabel match
+    column = 'side_picks' if action == 'pick' else 'side_bans'
+    rows = stats[column]
+    n_heroes, n_teams = len(stats['heroes']), len(stats['teams'])
+    counts = np.zeros((n_teams, n_heroes), dtype=np.float64)
+    valid = rows >= 0
+    teams = np.broadcast_to(stats['side_team'][:, None], rows.shape)
+    np.add.at(counts, (teams[valid], rows[valid]), 1.0)
+    total = counts.sum(axis=0)
+    prior = total / total.sum() if total.sum() else np.full(n_heroes, 1.0 / max(n_heroes, 1))
+    return counts, prior
+
+
+def score_tables(stats):
+    hero_lo = log_odds(stats['pick_win'], stats['pick_lose'])
+    pair_lo = log_odds(stats['pair_win'], stats['pair_lose'])
+    np.fill_diagonal(pair_lo, 0.0)
+    versus_lo = log_odds(stats['versus_win'], stats['versus_lose'])
+    return hero_lo, pair_lo, versus_lo
+
+
+def win_probability(ours, theirs, tables):
+    # ours/theirs: (R, 5) id hero, -1 untuk slot kosong
+    hero_lo, pair_lo, versus_lo = tables
+
+    def side_terms(ids):
+        valid = ids >= 0
+        safe = np.maximum(ids, 0)
+        n = valid.sum(axis=1)
+        hero = np.where(valid, hero_lo[safe], 0.0).sum(axis=1) / np.maximum(n, 1)
+        both = valid[:, :, None] & valid[:, None, :]
+        pairs = np.where(both, pair_lo[safe[:, :, None], safe[:, None, :]], 0.0).sum(axis=(1, 2)) / 2
+        return hero, pairs / np.maximum(n * (n - 1) / 2, 1), valid, safe
+
+    hero_a, pair_a, valid_a, safe_a = side_terms(ours)
+    hero_b, pair_b, valid_b, safe_b = side_terms(theirs)
+    both = valid_a[:, :, None] & valid_b[:, None, :]
+    versus = np.where(both, versus_lo[safe_a[:, :, None], safe_b[:, None, :]], 0.0).sum(axis=(1, 2))
+    versus /= np.maximum(both.sum(axis=(1, 2)), 1)
+    return 1.0 / (1.0 + np.exp(-(hero_a - hero_b + pair_a - pair_b + versus)))
+
+
+@stage('rollouts')
+def run_rollouts(job):
+    # job: dict array hasil prepare_rollouts + jumlah rollout per kandidat dan seed
+    rng = np.random.default_rng(job['seed'])
+    candidates = job['candidates']
+    n = job['n']
+    rows = len(candidates) * n
+    n_heroes = len(job['available'])
+
+    available = np.broadcast_to(job['available'], (rows, n_heroes)).copy()
+    first = np.repeat(candidates, n)
+    available[np.arange(rows), first] = False
+    lineups = {side: np.full((rows, 5), -1, dtype=np.int64) for side in ('A', 'B')}
+    filled = {}
+    for side in ('A', 'B'):
+        fixed = job['picks'][side][:5]
+        lineups[side][:, :len(fixed)] = fixed
+        filled[side] = len(fixed)
+    if job['first_action'] == 'pick' and filled[job['our_side']] < 5:
+        lineups[job['our_side']][:, filled[job['our_side']]] = first
+        filled[job['our_side']] += 1
+
+    for side, action in job['steps']:
+        log_p = job['log_p'][(side, action)]
+        # Gumbel-max: sampling tanpa pengembalian dari hero yang masih tersedia
+        keys = np.where(available, log_p + rng.gumbel(size=(rows, n_heroes)), -np.inf)
+        choice = keys.argmax(axis=1)
+        ok = np.isfinite(keys[np.arange(rows), choice])
+        available[np.arange(rows)[ok], choice[ok]] = False
+        if action == 'pick' and filled[side] < 5:
+            lineups[side][:, filled[side]] = np.where(ok, choice, -1)
+            filled[side] += 1
+
+    ours = lineups[job['our_side']]
+    theirs = lineups['B' if job['our_side'] == 'A' else 'A']
+    return win_probability(ours, theirs, job['tables']).reshape(len(candidates), n).sum(axis=1)
+
+
+def prepare_rollouts(model, state, candidates):
+    stats = model['stats']
+    hero_index, team_index = stats['hero_index'], stats['team_index']
+    our_side, root_step = locate_step(state)
+    their_side = 'B' if our_side == 'A' else 'A'
+    team_of = {our_side: state['team'], their_side: state['enemy']}
+
+    ids = lambda heroes: [hero_index[h] for h in heroes if h in hero_index]
+    picks = {our_side: ids(state['our_picks']), their_side: ids(state['enemy_picks'])}
+    available = np.ones(len(stats['heroes']), dtype=bool)
+    available[picks['A'] + picks['B'] + ids(state['our_bans']) + ids(state['enemy_bans'])] = False
+
+    log_p = {}
+    for action in ('pick', 'ban'):
+        counts, prior = team_tendencies(stats, action)
+        for side in ('A', 'B'):
+            t = team_index.get(team_of[side])
+            weights = (counts[t] if t is not None else 0.0) + PRIOR_WEIGHT * prior
+            # Hero yang belum pernah muncul tetap mungkin terpilih, dengan peluang sangat kecil
+            log_p[(side, action)] = np.log(weights / weights.sum() + 1e-12)
+
+    return {
+        'candidates': np.array([hero_index[h] for h in candidates], dtype=np.int64),
+        'available': available,
+        'picks': {side: np.array(p, dtype=np.int64) for side, p in picks.items()},
+        'our_side': our_side,
+        'first_action': DRAFT_ORDER[root_step][1],
+        'steps': DRAFT_ORDER[root_step + 1:],
+        'log_p': log_p,
+        'tables': score_tables(stats),
+    }
+
+
+@query('simulate')
+def simulate_draft(model, state, candidates=None, n_rollouts=10000, workers=1, seed=None):
+    # Estimasi peluang menang untuk setiap kandidat (default: top 5 rank_heroes)
+    if candidates is None:
+        candidates = [hero for hero, _ in rank_heroes(model, *state_args(state))]
+    # Kandidat unik (urutan tetap), hanya hero yang dikenal dan belum di-pick/ban
+    taken = set(state['our_picks'] + state['our_bans'] + state['enemy_picks'] + state['enemy_bans'])
+    candidates = [h for h in dict.fromkeys(candidates) if h in model['stats']['hero_index'] and h not in taken]
+    if not candidates:
+        return []
+    job = prepare_rollouts(model, state, candidates)
+
+    workers = max(1, min(workers, n_rollouts))
+    sizes = [n_rollouts // workers + (i < n_rollouts % workers) for i in range(workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    jobs = [dict(job, n=size, seed=s) for size, s in zip(sizes, seeds)]
+    if workers == 1:
+        wins = run_rollouts(jobs[0])
+    else:
+        with Pool(workers) as pool:
+            wins = sum(pool.map(run_rollouts, jobs))
+    probability = wins / n_rollouts
+    order = np.argsort(-probability, kind='stable')
+    return [(candidates[i], probability[i].item()) for i in order]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Monte Carlo win probability per kandidat')
+    add_state_arguments(parser)
+    parser.add_argument('--candidates', help='daftar hero dipisah koma (default: top 5 rekomendasi)')
+    parser.add_argument('--rollouts', type=int, default=10000, help='jumlah rollout per kandidat')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--csv', action='append', help='file CSV atau folder (boleh diulang)')
+    args = parser.parse_args(argv)
+
+    state = state_from_args(args)
+    check_turn(parser, state)
+    model = load_model(args.csv or DEFAULT_CSV)
+    candidates = hero_list(args.candidates) if args.candidates else None
+    start = time.perf_counter()
+    results = simulate_draft(model, state, candidates, args.rollouts, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nWin probability for {args.action.upper()} ({args.rollouts} rollouts each, {elapsed:.2f}s):")
+    for hero, p in results:
+        print(f"{hero} : {p * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import numpy as np
+from draft_graph import build_graphs
+from hero_graph import HeroGraph
+from matrix_stats import compute_team_weights, matrix_to_dicts, process_csv_matrix, table_to_matches
+from profiling import stage
+
+# Snapshot biner untuk model draft: satu file berisi header JSON (daftar hero,
+# tim, hash CSV) diikuti array numpy yang di-align sehingga bisa di-memory-map.
+
+MAGIC = b'DRAFTSNP'
+VERSION = 3
+ALIGN = 64
+
+STATS_ARRAYS = (
+    'side_team', 'side_win', 'side_picks', 'side_bans', 'side_ban_phase',
+    'pick_win', 'pick_lose', 'banned',
+    'pair_win', 'pair_lose', 'versus_win', 'versus_lose',
+    'pair_order', 'versus_order', 'team_weights',
+)
+
+
+def csv_hash(filename):
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_path_for(filename):
+    return filename + '.snapshot'
+
+
+def graph_to_arrays(G, hero_index):
+    nodes = np.array([hero_index[n] for n in G.nodes], dtype=np.int32)
+    # Id hero graf dipetakan ke id hero di stats
+    to_stats = np.array([hero_index[h] for h in G.heroes], dtype=np.int32)
+    rows, cols, weights = G.edge_arrays(insertion_order=True)
+    return nodes, to_stats[rows], to_stats[cols], weights.astype(np.float64)
+
+
+def arrays_to_graph(nodes, u, v, w, heroes, directed=False):
+    return HeroGraph.from_arrays(heroes, nodes, u, v, w, directed=directed)
+
+
+@stage('save_snapshot')
+def save_snapshot(path, digest, stats, G_dasar, G_counter):
+    arrays = {name: np.ascontiguousarray(stats[name]) for name in STATS_ARRAYS}
+    for prefix, G in (('dasar', G_dasar), ('counter', G_counter)):
+        nodes, u, v, w = graph_to_arrays(G, stats['hero_index'])
+        arrays[prefix + '_nodes'] = nodes
+        arrays[prefix + '_u'] = u
+        arrays[prefix + '_v'] = v
+        arrays[prefix + '_w'] = w
+
+    specs = {}
+    offset = 0
+    for name, arr in arrays.items():
+        specs[name] = {'dtype': arr.dtype.str, 'shape': list(arr.shape), 'offset': offset}
+        offset += -(-arr.nbytes // ALIGN) * ALIGN
+    header = json.dumps({
+        'version': VERSION,
+        'csv_sha256': digest,
+        'heroes': stats['heroes'],
+        'teams': stats['teams'],
+        'arrays': specs,
+    }).encode('utf-8')
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGN) * ALIGN
+
+    # Tulis ke file sementara dulu supaya snapshot lama tidak rusak setengah jalan
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, 'little'))
+        f.write(header)
+        for name, arr in arrays.items():
+            f.seek(data_start + specs[name]['offset'])
+            f.write(arr.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot_header(path):
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return None, 0
+        size = int.from_bytes(f.read(8), 'little')
+        header = json.loads(f.read(size).decode('utf-8'))
+    data_start = -(-(len(MAGIC) + 8 + size) // ALIGN) * ALIGN
+    return header, data_start
+
+
+@stage('load_snapshot')
+def load_snapshot(path, digest=None):
+    # Mengembalikan None jika snapshot tidak ada, rusak, atau hash CSV berbeda
+    try:
+        header, data_start = read_snapshot_header(path)
+    except (OSError, ValueError):
+        return None
+    if header is None or header.get('version') != VERSION:
+        return None
+    if digest is not None and header['csv_sha256'] != digest:
+        return None
+
+    buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        arrays[name] = np.ndarray(
+            tuple(spec['shape']), dtype=np.dtype(spec['dtype']),
+            buffer=buffer, offset=data_start + spec['offset'],
+        )
+
+    heroes = header['heroes']
+    stats = {name: arrays[name] for name in STATS_ARRAYS}
+    stats['heroes'] = heroes
+    stats['hero_index'] = {hero: i for i, hero in enumerate(heroes)}
+    stats['teams'] = header['teams']
+    stats['team_index'] = {team: i for i, team in enumerate(header['teams'])}
+    stats['csv_sha256'] = header['csv_sha256']
+
+    G_dasar = arrays_to_graph(arrays['dasar_nodes'], arrays['dasar_u'], arrays['dasar_v'],
+                              arrays['dasar_w'], heroes)
+    G_counter = arrays_to_graph(arrays['counter_nodes'], arrays['counter_u'], arrays['counter_v'],
+                                arrays['counter_w'], heroes, directed=True)
+    return stats, G_dasar, G_counter
+
+
+class DraftModel(dict):
+    # Model hasil load_or_build_snapshot. `matches`, `hero_stats`, `pair_wins`
+    # dan `versus` dibangun dari stats baru saat pertama kali diakses, sehingga
+    # warm start (rank_heroes hanya butuh stats dan graf) tidak bergantung
+    # pada jumlah match.
+    def __missing__(self, key):
+        if key == 'matches':
+            self['matches'] = table_to_matches(self['stats'])
+        elif key in ('hero_stats', 'pair_wins', 'versus'):
+            self['hero_stats'], self['pair_wins'], self['versus'] = matrix_to_dicts(self['stats'])
+        else:
+            raise KeyError(key)
+        return self[key]
+
+
+@stage('load_model')
+def load_or_build_snapshot(filename, path=None, digest=None, build_stats=process_csv_matrix):
+    # `filename` boleh berupa sumber lain (lihat ingest.py) selama `path`,
+    # `digest` dan `build_stats` untuk sumber tersebut diberikan
+    digest = digest or csv_hash(filename)
+    path = path or snapshot_path_for(filename)
+    loaded = load_snapshot(path, digest)
+
+    if loaded is not None:
+        stats, G_dasar, G_counter = loaded
+        return DraftModel(stats=stats, G_dasar=G_dasar, G_counter=G_counter)
+
+    stats = build_stats(filename)
+    stats['team_weights'] = compute_team_weights(stats)
+    stats['csv_sha256'] = digest
+    matches = stats.pop('matches', None)
+    hero_stats, pair_wins, versus = matrix_to_dicts(stats)
+    G_dasar, G_counter = build_graphs(hero_stats, pair_wins, versus)
+    try:
+        save_snapshot(path, digest, stats, G_dasar, G_counter)
+    except OSError as e:
+        print(f"Gagal menyimpan snapshot ({e}), lanjut tanpa snapshot.")
+    model = DraftModel(stats=stats, hero_stats=hero_stats, pair_wins=pair_wins, versus=versus,
+                       G_dasar=G_dasar, G_counter=G_counter)
+    if matches is not None:
+        model['matches'] = matches
+    return model
@@ -0,0 +1,103 @@
+import argparse
+import csv
+import random
+from main import LANES, hero_to_lanes
+
+# Generator data draft sintetis dengan skema yang sama seperti data_draft.csv:
+# match_id,team,action_type,hero,lane,is_winner
+# Kolom lane berisi lane untuk pick dan fase ('first'/'second') untuk ban.
+# Setiap match: 3 ban fase pertama + 2 ban fase kedua per tim, lalu 5 pick
+# per tim (satu per lane). Popularitas hero mengikuti distribusi Zipf dan
+# peluang menang mengikuti kekuatan tim.
+
+HEADER = ['match_id', 'team', 'action_type', 'hero', 'lane', 'is_winner']
+
+
+def make_hero_pool(n_heroes, rnd):
+    # Pakai hero asli (beserta lane-nya) lebih dulu, sisanya hero sintetis
+    pool = list(hero_to_lanes.items())[:n_heroes]
+    for i in range(len(pool), n_heroes):
+        lanes = {LANES[i % len(LANES)]}
+        if rnd.random() < 0.3:
+            lanes.add(rnd.choice(LANES))
+        pool.append((f'hero{i:04d}', lanes))
+    return pool
+
+
+def generate_rows(n_matches, n_heroes=80, n_teams=10, seed=0):
+    rnd = random.Random(seed)
+    pool = make_hero_pool(n_heroes, rnd)
+    heroes = [hero for hero, _ in pool]
+    popularity = [1.0 / (rank + 1) ** 0.8 for rank in range(n_heroes)]
+    rnd.shuffle(popularity)
+    by_lane = {
+        lane: [(i, popularity[i]) for i, (_, lanes) in enumerate(pool) if lane in lanes]
+        for lane in LANES
+    }
+    teams = [f'team{i:03d}' for i in range(n_teams)]
+    strength = {team: rnd.gauss(0, 1) for team in teams}
+
+    def draw(candidates, used):
+        ids = [i for i, _ in candidates]
+        weights = [w for _, w in candidates]
+        for _ in range(20):
+            hero = rnd.choices(ids, weights)[0]
+            if hero not in used:
+                return hero
+        free = [i for i in ids if i not in used]
+        return rnd.choice(free) if free else None
+
+    everyone = [(i, w) for i, w in enumerate(popularity)]
+    for m in range(n_matches):
+        match_id = f'M{m + 1:07d}'
+        t1, t2 = rnd.sample(teams, 2)
+        p1 = 1.0 / (1.0 + 2.718281828 ** (strength[t2] - strength[t1]))
+        winner = t1 if rnd.random() < p1 else t2
+        used = set()
+        rows = {t1: [], t2: []}
+
+        for phase, count in (('first', 3), ('second', 2)):
+            for _ in range(count):
+                for team in (t1, t2):
+                    hero = draw(everyone, used)
+                    if hero is not None:
+                        used.add(hero)
+                        rows[team].append(('ban', heroes[hero], phase))
+        picks = {t1: [], t2: []}
+        for lane in LANES:
+            for team in (t1, t2):
+                hero = draw(by_lane[lane] or everyone, used)
+                if hero is not None:
+                    used.add(hero)
+                    picks[team].append(('pick', heroes[hero], lane))
+
+        for team in (t1, t2):
+            is_winner = int(team == winner)
+            for action, hero, lane in rows[team]:
+                yield [match_id, team, action, hero, lane, is_winner]
+        for team in (t1, t2):
+            is_winner = int(team == winner)
+            for action, hero, lane in picks[team]:
+                yield [match_id, team, action, hero, lane, is_winner]
+
+
+def write_csv(filename, n_matches, n_heroes=80, n_teams=10, seed=0):
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(generate_rows(n_matches, n_heroes, n_teams, seed))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate synthetic draft data')
+    parser.add_argument('output')
+    parser.add_argument('-m', '--matches', type=int, default=10000)
+    parser.add_argument('--heroes', type=int, default=80)
+    parser.add_argument('--teams', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    write_csv(args.output, args.matches, args.heroes, args.teams, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+import os
+import random
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SYNTHETIC_MATCHES = 400
+SYNTHETIC_HEROES = 300
+
+
+@pytest.fixture(scope='session')
+def synthetic_csv(tmp_path_factory):
+    from synthetic_data import write_csv
+    path = str(tmp_path_factory.mktemp('synthetic') / 'draft.csv')
+    write_csv(path, SYNTHETIC_MATCHES, SYNTHETIC_HEROES, n_teams=10, seed=7)
+    return path
+
+
+@pytest.fixture(scope='session')
+def synthetic_lane_masks():
+    # Lane hero di synthetic_csv (make_hero_pool dengan seed yang sama)
+    from main import lane_mask
+    from synthetic_data import make_hero_pool
+    return {hero: lane_mask(lanes) for hero, lanes in make_hero_pool(SYNTHETIC_HEROES, random.Random(7))}
@@ -0,0 +1,12 @@
+from draft_search import search_draft
+from draft_sequence import empty_state
+from main import DEFAULT_CSV, load_model
+
+
+def test_opening_ban_scores_are_not_all_equal():
+    model = load_model(DEFAULT_CSV)
+    result = search_draft(model, empty_state('ban', 'onic', 'rrq'), depth=6, time_budget=60.0)
+    scores = [score for _, score in result['moves']]
+    assert result['depth'] == 6
+    assert len(set(scores)) > 1
+    assert scores == sorted(scores, reverse=True)
@@ -0,0 +1,37 @@
+import gc
+import weakref
+from edge_index import _indexes
+from hero_graph import HeroGraph
+
+
+def sorted_top(G, k):
+    return sorted(G.edges(data=True), key=lambda x: x[2]['weight'], reverse=True)[:k]
+
+
+def make_graph(directed=False):
+    G = HeroGraph(directed=directed)
+    G.add_weighted_edges_from([('a', 'b', 3.0), ('b', 'c', 1.0), ('c', 'd', 2.0), ('a', 'd', 2.0)])
+    return G
+
+
+def test_index_does_not_keep_graph_alive():
+    G = make_graph()
+    G.top_edges(2)
+    ref = weakref.ref(G)
+    del G
+    gc.collect()
+    assert ref() is None
+    assert len(_indexes) == 0
+
+
+def test_top_edges_follow_direct_edits():
+    for directed in (False, True):
+        G = make_graph(directed)
+        assert G.top_edges(3) == sorted_top(G, 3)
+        G.add_edge('d', 'e', weight=5.0)
+        assert G.top_edges(3) == sorted_top(G, 3)
+        G['a']['b']['weight'] = 0.5
+        assert G.top_edges(3) == sorted_top(G, 3)
+        G.remove_edge('d', 'e')
+        G.add_edge('b', 'c', weight=4.0)
+        assert G.top_edges(5) == sorted_top(G, 5)
@@ -0,0 +1,55 @@
+import random
+import networkx as nx
+import pytest
+from draft_graph import build_counter_graph_simple, build_sinergi_dasar_graph, counter_edge, sinergi_edge_weight
+from hero_graph import HeroGraph
+from main import DEFAULT_CSV, load_model
+
+
+def assert_same_order(G, H):
+    assert list(G.nodes) == list(H.nodes)
+    assert list(G.edges(data='weight')) == list(H.edges(data='weight'))
+    for node in H.nodes:
+        assert list(G.neighbors(node)) == list(H.neighbors(node))
+
+
+@pytest.mark.parametrize('source', ['bundled', 'synthetic'])
+def test_hero_graph_keeps_networkx_order(source, synthetic_csv):
+    model = load_model(DEFAULT_CSV if source == 'bundled' else synthetic_csv)
+    hero_stats, pair_wins, versus = model['hero_stats'], model['pair_wins'], model['versus']
+
+    dasar = nx.Graph()
+    for (h1, h2), stats in pair_wins.items():
+        weight = sinergi_edge_weight(h1, h2, stats, hero_stats)
+        if weight > 0:
+            dasar.add_edge(h1, h2, weight=weight)
+    counter = nx.DiGraph()
+    for (h1, h2), stats in versus.items():
+        edge = counter_edge(h1, h2, stats)
+        if edge is not None:
+            counter.add_edge(edge[0], edge[1], weight=edge[2])
+
+    assert_same_order(build_sinergi_dasar_graph(pair_wins, hero_stats), dasar)
+    assert_same_order(build_counter_graph_simple(versus), counter)
+    # Graf dari snapshot (HeroGraph.from_arrays)
+    warm = load_model(DEFAULT_CSV if source == 'bundled' else synthetic_csv)
+    assert_same_order(warm['G_dasar'], dasar)
+    assert_same_order(warm['G_counter'], counter)
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_hero_graph_edits_keep_networkx_order(directed):
+    rnd = random.Random(5)
+    G, H = HeroGraph(directed=directed), nx.DiGraph() if directed else nx.Graph()
+    names = [f'h{i}' for i in range(12)]
+    for _ in range(400):
+        u, v = rnd.choice(names), rnd.choice(names)
+        if H.has_edge(u, v) and rnd.random() < 0.4:
+            G.remove_edge(u, v)
+            H.remove_edge(u, v)
+        else:
+            weight = rnd.randint(1, 9)
+            G.add_edge(u, v, weight=weight)
+            H.add_edge(u, v, weight=weight)
+    assert_same_order(G, H)
+    assert_same_order(G.copy(), H)
@@ -0,0 +1,88 @@
+import json
+import threading
+from itertools import islice
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+import numpy as np
+import pytest
+from backtest import train_model
+from batch_recommend import history_states
+from draft_sequence import state_args
+from incremental import SIDE_ARRAYS, add_matches
+from main import DEFAULT_CSV, load_model, rank_heroes
+from recommend_server import make_server
+
+STATS_ARRAYS = SIDE_ARRAYS + (
+    'pick_win', 'pick_lose', 'banned', 'pair_win', 'pair_lose', 'versus_win', 'versus_lose', 'team_weights',
+)
+
+
+def edge_set(G):
+    if G.is_directed():
+        return {(u, v, w) for u, v, w in G.edges(data='weight')}
+    return {(frozenset((u, v)), w) for u, v, w in G.edges(data='weight')}
+
+
+@pytest.mark.parametrize('source', ['bundled', 'synthetic'])
+def test_incremental_model_matches_full_model(source, synthetic_csv):
+    full = load_model(DEFAULT_CSV if source == 'bundled' else synthetic_csv)
+    matches = full['matches']
+    model = train_model(matches[:len(matches) // 3])
+    assert add_matches(model, matches[len(matches) // 3:]) == len(matches) - len(matches) // 3
+
+    assert model['stats']['heroes'] == full['stats']['heroes']
+    assert model['stats']['teams'] == full['stats']['teams']
+    for name in STATS_ARRAYS:
+        np.testing.assert_array_equal(model['stats'][name], full['stats'][name], err_msg=name)
+    for name in ('G_dasar', 'G_counter'):
+        assert edge_set(model[name]) == edge_set(full[name]), name
+    for state in islice(history_states(matches), 300):
+        assert rank_heroes(model, *state_args(state)) == rank_heroes(full, *state_args(state))
+
+
+def post(port, path, payload):
+    request = Request(f'http://127.0.0.1:{port}{path}', data=json.dumps(payload).encode('utf-8'), method='POST')
+    try:
+        with urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_post_matches_validates_and_normalizes():
+    model = load_model(DEFAULT_CSV)
+    server = make_server(model, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    n_heroes = len(model['stats']['heroes'])
+
+    def match(onic, rrq):
+        return {'teams': {
+            'ONIC': dict({'pick': ['Chou', 'Ling '], 'ban': [' Fanny'], 'is_winner': 1}, **onic),
+            'rrq': dict({'pick': ['joy', 'harith'], 'ban': [], 'is_winner': 0}, **rrq),
+        }}
+
+    try:
+        before = post(port, '/recommend', {'action': 'ban', 'team': 'onic', 'enemy': 'rrq'})[1]
+        invalid = [
+            {'teams': {'onic': {}}},
+            match({}, {'is_winner': 1}),
+            match({'is_winner': '0'}, {}),
+            match({}, {'pick': ['joy', 'chou']}),
+            match({'pick': ['chou', 'Chou']}, {}),
+        ]
+        for payload in invalid:
+            status, body = post(port, '/matches', [match({}, {}), payload])
+            assert status == 400 and 'error' in body, payload
+        assert len(model['stats']['side_team']) // 2 == 217
+
+        status, body = post(port, '/matches', [match({}, {})])
+        assert status == 200 and body == {'added': 1, 'matches': 218}
+        stats = model['stats']
+        assert len(stats['heroes']) == n_heroes and 'onic' in stats['team_index']
+        assert model['matches'][-1]['teams']['onic']['pick'] == ['chou', 'ling']
+        after = post(port, '/recommend', {'action': 'ban', 'team': 'onic', 'enemy': 'rrq'})[1]
+        assert after != before
+    finally:
+        server.shutdown()
+        server.server_close()
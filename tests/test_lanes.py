@@ -0,0 +1,36 @@
+import random
+from itertools import product
+import pytest
+import main
+from main import ALL_LANE_MASK, LANES, free_lane_mask
+
+
+def brute_force_free_lanes(heroes, masks):
+    # Lane bebas = kosong di salah satu penempatan dengan hero terbanyak
+    options = [[None] + [i for i in range(len(LANES)) if masks[h] & (1 << i)] for h in heroes if masks.get(h)]
+    best, free = -1, 0
+    for lanes in product(*options):
+        placed = [lane for lane in lanes if lane is not None]
+        if len(set(placed)) != len(placed):
+            continue
+        occupied = sum(1 << lane for lane in placed)
+        if len(placed) > best:
+            best, free = len(placed), 0
+        if len(placed) == best:
+            free |= ALL_LANE_MASK & ~occupied
+    return free
+
+
+@pytest.mark.parametrize('source', ['bundled', 'synthetic'])
+def test_free_lane_mask_is_exact(source, synthetic_lane_masks, monkeypatch):
+    masks = main.hero_lane_masks if source == 'bundled' else synthetic_lane_masks
+    monkeypatch.setattr(main, 'hero_lane_masks', masks)
+    free_lane_mask.cache_clear()
+    rnd = random.Random(3)
+    heroes = sorted(masks)
+    try:
+        for _ in range(500):
+            picked = rnd.sample(heroes, rnd.randint(0, 5))
+            assert free_lane_mask(frozenset(picked)) == brute_force_free_lanes(picked, masks), picked
+    finally:
+        free_lane_mask.cache_clear()
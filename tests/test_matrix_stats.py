@@ -0,0 +1,35 @@
+import pytest
+from draft_graph import iter_csv_matches, process_csv_with_matches
+from main import DEFAULT_CSV
+from matrix_stats import matrix_to_dicts, process_csv_matrix, read_match_data
+
+
+@pytest.mark.parametrize('source', ['bundled', 'synthetic'])
+def test_matrix_to_dicts_matches_dict_engine(source, synthetic_csv):
+    filename = DEFAULT_CSV if source == 'bundled' else synthetic_csv
+    expected = process_csv_with_matches(filename)
+    stats = process_csv_matrix(filename)
+    for got, want in zip(matrix_to_dicts(stats), expected[:3]):
+        # Urutan kunci ikut menentukan urutan edge di graf
+        assert list(got.items()) == list(want.items())
+    assert [m['teams'].keys() for m in stats['matches']] == [m['teams'].keys() for m in expected[3]]
+
+
+@pytest.mark.parametrize('source', ['bundled', 'synthetic'])
+def test_streaming_reader_matches_grouped_reader(source, synthetic_csv):
+    filename = DEFAULT_CSV if source == 'bundled' else synthetic_csv
+    assert list(iter_csv_matches(filename, ban_phase=True)) == read_match_data(filename, ban_phase=True)
+
+
+def test_streaming_reader_rejects_split_match(tmp_path):
+    with open(DEFAULT_CSV, encoding='utf-8') as f:
+        header, *rows = f.read().splitlines()
+    first_id = rows[0].split(',')[0]
+    first = [row for row in rows if row.split(',')[0] == first_id]
+    rest = [row for row in rows if row.split(',')[0] != first_id]
+    # Baris tim kedua match pertama muncul lagi setelah match lain
+    split = [row for row in first if row.split(',')[1] == first[0].split(',')[1]]
+    path = tmp_path / 'split.csv'
+    path.write_text('\n'.join([header] + split + rest + [row for row in first if row not in split]) + '\n')
+    with pytest.raises(ValueError, match=first_id):
+        list(iter_csv_matches(str(path)))
@@ -0,0 +1,25 @@
+from itertools import islice
+import pytest
+import main
+import scoring
+from batch_recommend import history_states
+from draft_sequence import state_args
+from main import DEFAULT_CSV, free_lane_mask, load_model, rank_heroes
+
+
+@pytest.mark.parametrize('source', ['bundled', 'synthetic'])
+def test_pruned_ranking_matches_full_ranking(source, synthetic_csv, synthetic_lane_masks, monkeypatch):
+    if source == 'synthetic':
+        monkeypatch.setattr(main, 'hero_lane_masks', synthetic_lane_masks)
+    free_lane_mask.cache_clear()
+    model = load_model(DEFAULT_CSV if source == 'bundled' else synthetic_csv)
+    states = list(islice(history_states(model['matches']), 600))
+    try:
+        for top_n in (1, 5, 20):
+            monkeypatch.setattr(scoring, 'PRUNE_MIN_HEROES', 10 ** 9)
+            full = [rank_heroes(model, *state_args(state), top_n=top_n) for state in states]
+            monkeypatch.setattr(scoring, 'PRUNE_MIN_HEROES', 0)
+            pruned = [rank_heroes(model, *state_args(state), top_n=top_n) for state in states]
+            assert pruned == full
+    finally:
+        free_lane_mask.cache_clear()
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from main import DEFAULT_CSV, load_model
+from recommend_server import parse_window
+from windowed import HERO_ARRAYS, PAIR_ARRAYS, RollingWindow
+
+
+@pytest.fixture(scope='module')
+def model():
+    return load_model(DEFAULT_CSV)
+
+
+@pytest.mark.parametrize('half_life', [None, 2, 5, 30])
+def test_rolled_window_matches_fresh_window(model, half_life):
+    rolled = RollingWindow(model, half_life=half_life)
+    n = rolled.n_matches()
+    # Maju, mundur, menyusut dan melompat
+    for start, end in [(0, n), (0, 20), (10, 60), (50, 51), (0, n), (n - 5, n), (3, 4), (0, 0), (100, 150)]:
+        rolled.seek(start, end)
+        fresh = RollingWindow(model, half_life=half_life)
+        fresh.seek(start, end)
+        for name in HERO_ARRAYS + PAIR_ARRAYS + ('team_weights',):
+            a, b = rolled.scaled(name), fresh.scaled(name)
+            assert (a >= 0).all(), (name, start, end)
+            np.testing.assert_allclose(a, b, rtol=1e-6, atol=1e-6, err_msg=f'{name} {start}:{end}')
+
+
+@pytest.mark.parametrize('window', [{'last': 0.5}, {'start': 1.0}, {'end': True}, {'last': -1},
+                                    {'half_life': 0}, {'half_life': False}, {'half_life': '5'}])
+def test_parse_window_rejects_invalid_values(window):
+    with pytest.raises(ValueError):
+        parse_window({'window': window})
+
+
+def test_parse_window_accepts_int_bounds_and_float_half_life():
+    spec = dict(parse_window({'window': {'last': 50, 'half_life': 12.5}}))
+    assert spec == {'start': None, 'end': None, 'last': 50, 'half_life': 12.5}
@@ -0,0 +1,244 @@
+import numpy as np
+from scoring import get_score_matrices
+
+# Statistik per jendela waktu atas urutan match (CSV tidak punya kolom tanggal,
+# jadi "waktu" = nomor match dalam tabel match di model['stats']).
+#   - sliding window: hanya match [start, end)
+#   - decay eksponensial: match ke-i berbobot 0.5 ** ((end - 1 - i) / half_life)
+# Counter hero_stats, pair_wins dan versus (dalam bentuk matriks seperti
+# matrix_stats) diperbarui per match saat jendela bergeser: match baru
+# ditambahkan, match lama dikurangi, tanpa menghitung ulang semuanya.
+# Matriks skor (scoring.py) dibangun langsung dari counter tersebut, sehingga
+# rank_heroes bisa dipakai untuk jendela mana pun tanpa membangun graf NetworkX.
+
+HERO_ARRAYS = ('pick_win', 'pick_lose', 'banned')
+PAIR_ARRAYS = ('pair_win', 'pair_lose', 'versus_win', 'versus_lose')
+# Bobot tersimpan dinormalisasi ulang sebelum melewati batas ini
+MAX_SCALE = 1e100
+# Jika match yang dikeluarkan jauh lebih berat dari yang tersisa, mengurangi
+# bobotnya menghapus presisi sisa counter; jendela dihitung ulang dari nol
+RESET_RATIO = 1e8
+EPSILON = 1e-9
+
+
+class RollingWindow:
+    def __init__(self, model, half_life=None):
+        self.model = model
+        self.decay = 0.5 ** (1.0 / half_life) if half_life else 1.0
+        self.start = self.end = 0
+        # Match ke-i disimpan dengan bobot decay ** -(i - base)
+        self.base = 0
+        self.rows = []
+        self.version = 0
+        self._cached = None
+        self.counts = {}
+        self._grow()
+
+    def _grow(self):
+        stats = self.model['stats']
+        n_heroes, n_teams = len(stats['heroes']), len(stats['teams'])
+        for name in HERO_ARRAYS:
+            self.counts[name] = _pad(self.counts.get(name), (n_heroes,))
+        for name in PAIR_ARRAYS:
+            self.counts[name] = _pad(self.counts.get(name), (n_heroes, n_heroes))
+        self.counts['team_weights'] = _pad(self.counts.get('team_weights'), (n_teams, n_heroes))
+
+    def n_matches(self):
+        return len(self.model['stats']['side_team']) // 2
+
+    def _match(self, m):
+        # Baris tabel match dikonversi ke list sekali saja (dan ditambah jika model bertambah)
+        if m >= len(self.rows):
+            stats = self.model['stats']
+            first = 2 * len(self.rows)
+            side_team = stats['side_team'][first:].tolist()
+            side_win = stats['side_win'][first:].tolist()
+            side_picks = stats['side_picks'][first:].tolist()
+            side_bans = stats['side_bans'][first:].tolist()
+            for r in range(0, len(side_team) - 1, 2):
+                self.rows.append(tuple(
+                    (side_team[s], side_win[s],
+                     [h for h in side_picks[s] if h >= 0], [h for h in side_bans[s] if h >= 0])
+                    for s in (r, r + 1)
+                ))
+            self._grow()
+        return self.rows[m]
+
+    def _apply(self, m, sign):
+        c = self.counts
+        w = sign * self.decay ** (self.base - m)
+        (team1, win1, picks1, bans1), (team2, win2, picks2, bans2) = self._match(m)
+        for team, win, picks, bans, enemy_picks, enemy_bans in (
+            (team1, win1, picks1, bans1, picks2, bans2),
+            (team2, win2, picks2, bans2, picks1, bans1),
+        ):
+            pick_counts = c['pick_win'] if win else c['pick_lose']
+            pair_counts = c['pair_win'] if win else c['pair_lose']
+            versus_counts = c['versus_win'] if win else c['versus_lose']
+            for h in bans:
+                c['banned'][h] += w
+            for i, a in enumerate(picks):
+                pick_counts[a] += w
+                for b in picks[i + 1:]:
+                    pair_counts[a, b] += w
+                    if a != b:
+                        pair_counts[b, a] += w
+                for e in enemy_picks:
+                    versus_counts[a, e] += w
+            weights = c['team_weights'][team]
+            bonus = 0.3 if win else 0.2
+            for h in set(picks):
+                weights[h] += bonus * w
+            for h in set(enemy_bans):
+                weights[h] += 0.5 * w
+
+    def _rebase(self, m):
+        factor = self.decay ** (m - self.base)
+        for arr in self.counts.values():
+            arr *= factor
+        self.base = m
+
+    def seek(self, start, end):
+        # Geser jendela ke [start, end); biaya sebanding dengan jumlah match yang berubah
+        end = max(0, min(end, self.n_matches()))
+        start = max(0, min(start, end))
+        if (start, end) == (self.start, self.end):
+            return
+        old = range(self.start, self.end)
+        if self.decay != 1.0 and self._needs_reset(old, start, end):
+            self._reset(start, end)
+            return
+        if self.decay != 1.0 and self.decay ** (self.base - end) > MAX_SCALE:
+            self._rebase(end - 1)
+        for m in old:
+            if not start <= m < end:
+                self._apply(m, -1.0)
+        for m in range(start, end):
+            if m not in old:
+                self._apply(m, 1.0)
+        self.start, self.end = start, end
+        self.version += 1
+
+    def _needs_reset(self, old, start, end):
+        removed = [m for m in old if not start <= m < end]
+        if not removed:
+            return False
+        if end <= start or end - 1 < self.base:
+            return True
+        # Bobot tersimpan naik dengan nomor match: bandingkan yang terberat di kedua sisi
+        return self.decay ** (end - 1 - max(removed)) > RESET_RATIO
+
+    def _reset(self, start, end):
+        for arr in self.counts.values():
+            arr.fill(0.0)
+        self.base = max(end - 1, 0)
+        for m in range(start, end):
+            self._apply(m, 1.0)
+        self.start, self.end = start, end
+        self.version += 1
+
+    def scaled(self, name):
+        # Nilai counter dengan bobot decay relatif terhadap match terakhir di jendela
+        arr = self.counts[name]
+        if self.decay != 1.0:
+            arr = arr * self.decay ** (self.end - 1 - self.base)
+        # Sisa pembulatan dari match yang sudah keluar jendela dianggap nol
+        return np.where(np.abs(arr) < EPSILON, 0.0, arr)
+
+    def score_matrices(self):
+        pair_win, pair_lose = self.scaled('pair_win'), self.scaled('pair_lose')
+        # Sama dengan sinergi_edge_weight untuk pasangan yang muncul di jendela
+        synergy = 0.6 * pair_win + 0.3 * pair_lose
+        adjacency = (synergy > 0).astype(np.float64)
+        synergy *= adjacency
+
+        # Sama dengan counter_edge: edge dari hero yang lebih sering menang
+        net = self.scaled('versus_win') - self.scaled('versus_lose')
+        counter = np.maximum(np.maximum(net, -net.T), 0.0)
+
+        n_heroes = len(adjacency)
+        degree = adjacency.sum(axis=1)
+        order = np.arange(n_heroes, dtype=np.int64) + n_heroes
+        # Urutan node G_dasar penuh dipakai untuk memecah skor yang sama
+        full_order = get_score_matrices(self.model)['order']
+        shared = min(n_heroes, len(full_order))
+        known = full_order[:shared] < len(full_order)
+        order[:shared][known] = full_order[:shared][known]
+        candidates = degree > 0
+        order[~candidates] = 2 * n_heroes
+        return {
+            'n_heroes': n_heroes,
+            'adjacency': adjacency,
+            'strength': synergy.sum(axis=1),
+            'degree': degree,
+            'self_loop': np.diag(adjacency).copy(),
+            'counter_delta': counter - counter.T,
+            'candidates': candidates,
+            'order': order,
+        }
+
+    def window_model(self):
+        # Model ringan untuk rank_heroes/score_all/draft_search pada jendela ini
+        if self._cached is not None and self._cached[0] == self.version:
+            return self._cached[1]
+        self._grow()
+        stats = self.model['stats']
+        # Salinan daftar hero/tim: model penuh bisa bertambah hero lewat incremental
+        model = {
+            'stats': {
+                'heroes': list(stats['heroes']),
+                'hero_index': dict(stats['hero_index']),
+                'teams': list(stats['teams']),
+                'team_index': dict(stats['team_index']),
+                'team_weights': self.scaled('team_weights'),
+            },
+            'window': (self.start, self.end),
+        }
+        model['score_matrices'] = self.score_matrices()
+        self._cached = (self.version, model)
+        return model
+
+    def window_dicts(self):
+        # hero_stats, pair_wins, versus untuk jendela ini (bentuk dict seperti process_csv_with_matches)
+        heroes = self.model['stats']['heroes']
+        c = {name: self.scaled(name) for name in HERO_ARRAYS + PAIR_ARRAYS}
+        hero_stats = {
+            heroes[h]: {name: c[name][h].item() for name in HERO_ARRAYS}
+            for h in np.flatnonzero(c['pick_win'] + c['pick_lose'] + c['banned']).tolist()
+        }
+        pair_wins = {}
+        a_ids, b_ids = np.nonzero(np.triu(c['pair_win'] + c['pair_lose']))
+        for a, b in zip(a_ids.tolist(), b_ids.tolist()):
+            pair = tuple(sorted((heroes[a], heroes[b])))
+            win, lose = c['pair_win'][a, b].item(), c['pair_lose'][a, b].item()
+            pair_wins[pair] = {'win': win, 'lose': lose, 'freq': win + lose}
+        versus = {}
+        a_ids, b_ids = np.nonzero(c['versus_win'] + c['versus_lose'])
+        for a, b in zip(a_ids.tolist(), b_ids.tolist()):
+            versus[(heroes[a], heroes[b])] = {'win': c['versus_win'][a, b].item(),
+                                              'lose': c['versus_lose'][a, b].item()}
+        return hero_stats, pair_wins, versus
+
+
+def _pad(arr, shape):
+    if arr is not None and arr.shape == shape:
+        return arr
+    out = np.zeros(shape, dtype=np.float64)
+    if arr is not None:
+        out[tuple(slice(0, n) for n in arr.shape)] = arr
+    return out
+
+
+def window_bounds(n_matches, start=None, end=None, last=None):
+    # Jendela [start, end) dalam nomor match; `last` = hanya N match terakhir sebelum end
+    end = n_matches if end is None else min(end, n_matches)
+    start = 0 if start is None else start
+    if last is not None:
+        start = max(start, end - last)
+    return start, end
+
+
+def window_model(model, start=None, end=None, last=None, half_life=None):
+    window = RollingWindow(model, half_life=half_life)
+    window.seek(*window_bounds(window.n_matches(), start, end, last))
+    return window.window_model()